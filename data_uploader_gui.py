@@ -12,16 +12,83 @@ Features:
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox
+import tkinter.font as tkfont
 import threading
 import queue
-import json
 import os
 import sys
-import shutil
+import time
+import tempfile
+import hashlib
+import importlib.util
 from pathlib import Path
 import traceback
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Log tab keeps only the newest lines, and re-renders at most ~30 times a second
+LOG_MAX_LINES = 5000
+LOG_REFRESH_MS = 33
+# Intermediate progress-bar updates are sent at most this often (seconds)
+PROGRESS_MIN_INTERVAL = 0.05
+
+# Files larger than this are streamed in chunks of CHUNK_ROWS instead of read whole
+# (overridable with "chunked_upload_mb" / "chunk_rows" in config.json)
+CHUNKED_UPLOAD_MB = 50
+CHUNK_ROWS = 25000
+
+# File extensions accepted by drag-and-drop (lowercase, no dot)
+DROP_EXTENSIONS = {'xlsx', 'xls', 'csv'}
+
+# Dropped files go to the first folder (in this order) with a keyword in the file name
+FOLDER_KEYWORDS = {
+    'ActiveInsurance': ['active', 'insurance'],
+    'AriaData': ['aria'],
+    'AtRisk': ['atrisk', 'at-risk', 'risk'],
+    'Fractions': ['fraction'],
+    'ICD_Crosswalk': ['icd', 'crosswalk'],
+    'PatientDOB': ['patient', 'dob', 'birth'],
+    'PayerCrosswalk': ['payer', 'crosswalk'],
+    'ReferralRaw': ['referral'],
+    'ResearchPateint': ['research', 'patient'],
+    'TransactionsRaw': ['transaction']
+}
+# Built once: (folder, keywords) pairs in priority order
+_FOLDER_PATTERNS = tuple((folder, tuple(kws)) for folder, kws in FOLDER_KEYWORDS.items())
+
+# (second, text) of the last log timestamp; log lines within one second share it
+_log_stamp = (0, '')
+
+
+def _log_timestamp():
+    """Local time as 'YYYY-mm-dd HH:MM:SS', formatted at most once per second"""
+    global _log_stamp
+    now = int(time.time())
+    sec, text = _log_stamp
+    if sec != now:
+        text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        # One tuple assignment, so other threads never see a mismatched pair
+        _log_stamp = (now, text)
+    return text
+
+
+def write_file_atomic(path, data):
+    """Write bytes to a temp file beside `path`, then os.replace it into place,
+    so a reader (or a crash mid-write) never sees a half-written file"""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
 
 # Try to import tkinterdnd2 for drag-and-drop support
 HAS_DND = False
@@ -35,15 +102,21 @@ except (ImportError, Exception) as e:
     HAS_DND = False
     print(f"Note: Drag-and-drop not available ({e}). You can still click to select files.")
 
-# Import the existing upload_refresh functionality
+# Import the existing upload_refresh functionality (it loads pandas lazily, on first
+# use, so the window opens without paying pandas' import time)
 try:
     from upload_refresh import (
-        connect_from_cfg, test_connection, list_tables, get_tables_list,
+        test_connection, list_tables, get_tables_list,
         upload_from_folders, run_sql_scripts, list_sql_files,
-        ensure_folders_from_config, get_table_columns
+        ensure_folders_from_config, get_table_columns, invalidate_column_cache,
+        pooled_connection, close_pooled_connections,
+        prefetch_files, read_table_file, upload_options_from_cfg,
+        json_loads, json_dumps, json_dumps_pretty
     )
-    import pandas as pd
-    import pyodbc
+    # Check that pandas/pyodbc are installed without importing them
+    _missing = [name for name in ('pandas', 'pyodbc') if importlib.util.find_spec(name) is None]
+    if _missing:
+        raise ImportError(f"No module named {', '.join(_missing)}")
 except ImportError as e:
     print(f"Missing dependencies: {e}")
     print("Please install required packages: pip install pandas pyodbc openpyxl")
@@ -63,18 +136,42 @@ class DataUploaderGUI:
         
         # Threading for long operations
         self.operation_queue = queue.Queue()
-        self.check_queue()
+        self.log_queue = queue.Queue()
+        # Lines currently shown in the log tab (also what "Save Logs" writes)
+        self._log_ring = deque(maxlen=LOG_MAX_LINES)
+        self._log_row_ids = deque()
+        self._log_flushed_at = 0.0
+        self._log_flush_scheduled = False
+        
+        # Table list cache: {(server, database, driver): (fetched_at, tables)}
+        self._tables_cache = {}
+        self._tables_cache_lock = threading.Lock()
+        self._tables_cache_ttl = self.config.get('tables_cache_ttl', 300)
+        self._tables_disk_cache = Path.home() / '.data_uploader' / 'tables_cache.json'
+        
+        # Set when per-folder upload modes change; start_upload only rewrites config.json then.
+        # Starts set if the config still has the legacy truncate_before_load keys to clean up.
+        self._config_dirty = any('truncate_before_load' in fc for fc in self.config.get('folders', []))
+        self._progress_posted_at = 0.0
+        # Script names shown in the SQL listbox (filled by refresh_sql_list)
+        self._sql_files = []
+        
+        # Queues are drained when a <<QueueEvent>> arrives instead of by polling
+        self._drain_pending = False
+        self.root.bind('<<QueueEvent>>', self.check_queue)
         
         # Create the interface (this creates the notebook and all tabs)
         self.create_widgets()
         self.load_config_to_ui()
+        # Show anything logged while the widgets were being built
+        self.root.after_idle(self.check_queue)
         
     def load_config(self):
         """Load configuration from config.json"""
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    return json_loads(f.read())
             except Exception as e:
                 messagebox.showerror("Config Error", f"Failed to load config: {e}")
         return self.get_default_config()
@@ -90,11 +187,29 @@ class DataUploaderGUI:
                 "username": "",
                 "password": ""
             },
+            "max_parallel_uploads": 4,
+            "bulk_insert_dir": "",
+            "dtype_backend": "",
+            "chunked_upload_mb": 50,
+            "chunk_rows": 25000,
+            "batch_size": 5000,
+            "commit_rows": 100000,
+            "transaction_per_folder": True,
             "folders": []
         }
     
     def create_widgets(self):
         """Create the main GUI widgets"""
+        # Named fonts are created once and shared by every widget, rather than
+        # each widget resolving its own ('Arial', size) tuple
+        self.font_title = tkfont.Font(root=self.root, family='Arial', size=14, weight='bold')
+        self.font_drop = tkfont.Font(root=self.root, family='Arial', size=12)
+        self.font_status = tkfont.Font(root=self.root, family='Arial', size=10, weight='bold')
+        self.font_label = tkfont.Font(root=self.root, family='Arial', size=9)
+        self.font_label_bold = tkfont.Font(root=self.root, family='Arial', size=9, weight='bold')
+        self.font_small = tkfont.Font(root=self.root, family='Arial', size=8)
+        self.font_small_bold = tkfont.Font(root=self.root, family='Arial', size=8, weight='bold')
+        
         # Create notebook for tabs FIRST
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
@@ -118,7 +233,7 @@ class DataUploaderGUI:
         
         # Connection settings
         ttk.Label(self.conn_frame, text="Database Connection Settings", 
-                 font=('Arial', 14, 'bold')).pack(pady=10)
+                 font=self.font_title).pack(pady=10)
         
         # Server settings frame
         server_frame = ttk.LabelFrame(self.conn_frame, text="Server Configuration", padding=10)
@@ -197,8 +312,8 @@ class DataUploaderGUI:
         
         # Selected table display
         self.selected_table_var = tk.StringVar(value="No table selected")
-        ttk.Label(browser_frame, text="Selected Table:", font=('Arial', 9, 'bold')).pack(anchor='w', pady=(5, 2))
-        ttk.Label(browser_frame, textvariable=self.selected_table_var, font=('Arial', 9), 
+        ttk.Label(browser_frame, text="Selected Table:", font=self.font_label_bold).pack(anchor='w', pady=(5, 2))
+        ttk.Label(browser_frame, textvariable=self.selected_table_var, font=self.font_label, 
                  foreground='blue').pack(anchor='w', pady=(0, 5))
         
         # Bind double-click to select table
@@ -213,9 +328,9 @@ class DataUploaderGUI:
         title_frame = ttk.Frame(self.upload_frame)
         title_frame.pack(fill='x', padx=10, pady=10)
         ttk.Label(title_frame, text="Upload Data to Tables", 
-                 font=('Arial', 14, 'bold')).pack(anchor='w')
+                 font=self.font_title).pack(anchor='w')
         ttk.Label(title_frame, text="Select a table, drop your files, validate, then upload.", 
-                 font=('Arial', 9), foreground='gray').pack(anchor='w')
+                 font=self.font_label, foreground='gray').pack(anchor='w')
         
         # Quick table selection frame
         quick_select_frame = ttk.LabelFrame(self.upload_frame, text="Quick Table Selection", padding=10)
@@ -229,14 +344,14 @@ class DataUploaderGUI:
         self.quick_table_combo.bind('<<ComboboxSelected>>', self.on_quick_table_select)
         
         ttk.Button(quick_select_frame, text="Refresh Tables", 
-                  command=self.refresh_quick_tables).pack(side='left', padx=5)
+                  command=lambda: self.refresh_quick_tables(force=True)).pack(side='left', padx=5)
         
         # File drop zone
         drop_zone_frame = ttk.LabelFrame(self.upload_frame, text="Drop Files Here", padding=10)
         drop_zone_frame.pack(fill='both', expand=True, padx=10, pady=5)
         
         self.drop_zone = tk.Label(drop_zone_frame, text="Drag and drop Excel or CSV files here\nor click to select files", 
-                                  font=('Arial', 12), bg='#f0f0f0', relief='sunken', 
+                                  font=self.font_drop, bg='#f0f0f0', relief='sunken', 
                                   borderwidth=2, padx=20, pady=40)
         self.drop_zone.pack(fill='both', expand=True)
         
@@ -265,6 +380,8 @@ class DataUploaderGUI:
         # Store current table and files
         self.current_upload_table = None
         self.current_upload_files = []
+        # Normalized paths of current_upload_files, for O(1) duplicate checks
+        self._selected_files_set = set()
         
         # Upload mode selection
         mode_frame = ttk.LabelFrame(self.upload_frame, text="Upload Mode", padding=10)
@@ -276,6 +393,14 @@ class DataUploaderGUI:
         ttk.Radiobutton(mode_frame, text="Append new data to existing data", 
                        variable=self.upload_mode_var, value='append').pack(anchor='w', padx=5)
         
+        # Rows sent per insert batch (larger = fewer round trips, more memory per batch)
+        batch_frame = ttk.Frame(mode_frame)
+        batch_frame.pack(anchor='w', padx=5, pady=(5, 0))
+        ttk.Label(batch_frame, text="Rows per batch:").pack(side='left')
+        self.batch_size_var = tk.IntVar(value=upload_options_from_cfg(self.config)['batch_size'])
+        ttk.Spinbox(batch_frame, from_=100, to=100000, increment=500, 
+                    textvariable=self.batch_size_var, width=8).pack(side='left', padx=5)
+        
         # Action buttons
         action_frame = ttk.Frame(self.upload_frame)
         action_frame.pack(fill='x', padx=10, pady=10)
@@ -300,7 +425,7 @@ class DataUploaderGUI:
             print("DEBUG: SQL Scripts tab created and added to notebook")
             
             ttk.Label(self.sql_frame, text="SQL Script Execution", 
-                     font=('Arial', 14, 'bold')).pack(pady=10)
+                     font=self.font_title).pack(pady=10)
             
             # SQL files list
             sql_list_frame = ttk.LabelFrame(self.sql_frame, text="Available SQL Scripts", padding=10)
@@ -359,7 +484,7 @@ class DataUploaderGUI:
                      foreground='red').pack(pady=20)
         
         ttk.Label(self.logs_frame, text="Operation Logs", 
-                 font=('Arial', 14, 'bold')).pack(pady=10)
+                 font=self.font_title).pack(pady=10)
         
         # Progress bar
         self.progress_var = tk.DoubleVar()
@@ -368,12 +493,22 @@ class DataUploaderGUI:
         
         # Status label
         self.status_var = tk.StringVar(value="Ready")
-        self.status_label = ttk.Label(self.logs_frame, textvariable=self.status_var, font=('Arial', 10, 'bold'))
+        self.status_label = ttk.Label(self.logs_frame, textvariable=self.status_var, font=self.font_status)
         self.status_label.pack(pady=5)
         
-        # Log text area
-        self.log_text = scrolledtext.ScrolledText(self.logs_frame, height=18, width=80)
-        self.log_text.pack(fill='both', expand=True, padx=10, pady=5)
+        # Log view: a Treeview only holds LOG_MAX_LINES rows, so memory and redraw
+        # cost stay flat over long runs (a Text widget grows without bound)
+        log_view_frame = ttk.Frame(self.logs_frame)
+        log_view_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        self.log_tree = ttk.Treeview(log_view_frame, columns=('ts', 'msg'), show='headings', height=18)
+        self.log_tree.heading('ts', text='Time')
+        self.log_tree.heading('msg', text='Message')
+        self.log_tree.column('ts', width=140, stretch=False)
+        self.log_tree.column('msg', width=700, stretch=True)
+        log_scroll = ttk.Scrollbar(log_view_frame, orient='vertical', command=self.log_tree.yview)
+        self.log_tree.configure(yscrollcommand=log_scroll.set)
+        self.log_tree.pack(side='left', fill='both', expand=True)
+        log_scroll.pack(side='right', fill='y')
         
         # Log buttons
         log_button_frame = ttk.Frame(self.logs_frame)
@@ -406,6 +541,11 @@ class DataUploaderGUI:
             self.toggle_auth()
             self.refresh_table_list()
             self.refresh_sql_list()
+            # Show the last known table list immediately, then revalidate against the DB
+            cached_tables = self._load_tables_disk_cache()
+            if cached_tables:
+                self.show_tables(cached_tables)
+                self.log_message(f"Loaded {len(cached_tables)} cached table(s); refreshing in background")
             # Refresh quick tables in upload tab if it exists
             if hasattr(self, 'quick_table_combo'):
                 self.refresh_quick_tables()
@@ -416,69 +556,140 @@ class DataUploaderGUI:
     def save_config(self):
         """Save current configuration"""
         try:
-            self.config['db'] = {
+            # Update in place so options not shown in the UI (e.g. "client") survive a save
+            self.config.setdefault('db', {}).update({
                 'driver': self.driver_var.get(),
                 'server': self.server_var.get(),
                 'database': self.database_var.get(),
                 'trusted_connection': self.trusted_var.get(),
                 'username': self.username_var.get() if not self.trusted_var.get() else '',
                 'password': self.password_var.get() if not self.trusted_var.get() else ''
-            }
-            
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2)
-            
-            self.log_message("Configuration saved successfully")
-            messagebox.showinfo("Success", "Configuration saved successfully!")
+            })
+            # Cached table schemas and idle connections may belong to the previous server/database
+            invalidate_column_cache()
+            close_pooled_connections()
+            # Serialize now (a consistent snapshot), write the file off the UI thread
+            data = json_dumps_pretty(self.config)
         except Exception as e:
             self.log_message(f"Error saving configuration: {e}")
             messagebox.showerror("Error", f"Failed to save configuration: {e}")
+            return
+        
+        def write_config():
+            try:
+                write_file_atomic(self.config_path, data)
+                self.log_message("Configuration saved successfully")
+                self.post_message(("success", "Configuration saved successfully!"))
+            except Exception as e:
+                self.log_message(f"Error saving configuration: {e}")
+                self.post_message(("error", f"Failed to save configuration: {e}"))
+        
+        threading.Thread(target=write_config, daemon=True).start()
     
     def test_connection(self):
         """Test database connection"""
         def test_conn():
             try:
                 self.log_message("Testing database connection...")
-                result = test_connection(self.config_path)
+                with self._borrow_conn() as conn:
+                    result = test_connection(self.config_path, conn=conn)
                 if result == 0:
                     self.log_message("✓ Database connection successful!")
-                    self.operation_queue.put(("success", "Database connection successful!"))
+                    self.post_message(("success", "Database connection successful!"))
                     # Auto-refresh table list on successful connection
                     self.root.after(500, self.browse_tables)
                 else:
                     self.log_message("✗ Database connection failed!")
-                    self.operation_queue.put(("error", "Database connection failed!"))
+                    self.post_message(("error", "Database connection failed!"))
             except Exception as e:
                 self.log_message(f"✗ Connection error: {e}")
-                self.operation_queue.put(("error", f"Connection error: {e}"))
+                self.post_message(("error", f"Connection error: {e}"))
         
         threading.Thread(target=test_conn, daemon=True).start()
     
+    def _borrow_conn(self, reuse=True):
+        """Borrow a pooled connection for the current settings (see pooled_connection)"""
+        return pooled_connection(self.config.get('db', {}), reuse=reuse)
+    
+    def get_tables_cached(self, force=False):
+        """Return get_tables_list() for the current connection settings.
+        Results are reused for tables_cache_ttl seconds (default 300) unless force=True."""
+        db = self.config.get('db', {})
+        key = (db.get('server'), db.get('database'), db.get('driver'))
+        with self._tables_cache_lock:
+            if force:
+                self._tables_cache.clear()
+            cached = self._tables_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self._tables_cache_ttl:
+            return cached[1]
+        
+        try:
+            with self._borrow_conn() as conn:
+                tables = get_tables_list(self.config_path, conn=conn)
+        except Exception as e:
+            print(f"Could not fetch table list: {e}")
+            return []
+        if tables:
+            with self._tables_cache_lock:
+                self._tables_cache[key] = (time.monotonic(), tables)
+            self._save_tables_disk_cache(tables)
+        return tables
+    
+    def _tables_cache_hash(self):
+        """Identify the database the on-disk table cache belongs to"""
+        db = self.config.get('db', {})
+        ident = f"{db.get('server', '')}|{db.get('database', '')}|{db.get('driver', '')}"
+        return hashlib.sha1(ident.encode('utf-8')).hexdigest()
+    
+    def _save_tables_disk_cache(self, tables):
+        """Persist the table list so the next start can show it before the DB answers"""
+        try:
+            self._tables_disk_cache.parent.mkdir(parents=True, exist_ok=True)
+            data = json_dumps({"hash": self._tables_cache_hash(), "ts": time.time(),
+                               "tables": [list(t) for t in tables]})
+            write_file_atomic(self._tables_disk_cache, data)
+        except Exception as e:
+            print(f"Note: could not write table cache: {e}")
+    
+    def _load_tables_disk_cache(self):
+        """Return the cached table list for the current database, or None"""
+        try:
+            with open(self._tables_disk_cache, 'rb') as f:
+                cached = json_loads(f.read())
+        except Exception:
+            return None
+        if cached.get('hash') != self._tables_cache_hash():
+            return None
+        return [tuple(t) for t in cached.get('tables', [])]
+    
+    def show_tables(self, tables):
+        """Fill the table browser and the upload-tab selector from a table list
+        (UI thread only; worker threads post ("tables", tables) instead)"""
+        self.table_listbox.delete(0, tk.END)
+        for schema, table, full_name in tables:
+            self.table_listbox.insert(tk.END, f"{schema}.{table}")
+        if hasattr(self, 'quick_table_combo'):
+            self.quick_table_combo['values'] = [full_name for _, _, full_name in tables]
+        # Store tables list for later retrieval (listbox index -> table)
+        self.available_tables = tables
+    
     def browse_tables(self):
         """Browse and display available tables from the database"""
         def browse():
             try:
                 self.log_message("Loading tables from database...")
-                tables = get_tables_list(self.config_path)
+                tables = self.get_tables_cached()
                 if not tables:
                     self.log_message("No tables found or connection failed")
-                    self.operation_queue.put(("error", "No tables found. Check connection and permissions."))
+                    self.post_message(("error", "No tables found. Check connection and permissions."))
                     return
                 
-                # Update listbox
-                self.table_listbox.delete(0, tk.END)
-                for schema, table, full_name in tables:
-                    display_name = f"{schema}.{table}"
-                    self.table_listbox.insert(tk.END, display_name)
-                    # Store full_name as item data (we'll use index to retrieve)
-                
-                # Store tables list for later retrieval
-                self.available_tables = tables
+                self.post_message(("tables", tables))
                 self.log_message(f"Found {len(tables)} table(s)")
-                self.operation_queue.put(("success", f"Found {len(tables)} table(s)"))
+                self.post_message(("success", f"Found {len(tables)} table(s)"))
             except Exception as e:
                 self.log_message(f"Error browsing tables: {e}")
-                self.operation_queue.put(("error", f"Error browsing tables: {e}"))
+                self.post_message(("error", f"Error browsing tables: {e}"))
         
         threading.Thread(target=browse, daemon=True).start()
     
@@ -493,27 +704,23 @@ class DataUploaderGUI:
             schema, table, full_name = self.available_tables[idx]
             self.selected_table_var.set(full_name)
             self.log_message(f"Selected table: {full_name}")
-            # Also update quick table selector in upload tab
+            # Also update quick table selector in upload tab (the list is already loaded)
             if hasattr(self, 'quick_table_combo'):
-                self.refresh_quick_tables()
-                # Try to set the selection
-                try:
-                    idx = [t[2] for t in self.available_tables].index(full_name)
-                    if idx < len(self.quick_table_combo['values']):
-                        self.quick_table_var.set(self.quick_table_combo['values'][idx])
-                        self.current_upload_table = full_name
-                except:
-                    pass
+                self.quick_table_combo['values'] = [t[2] for t in self.available_tables]
+                self.quick_table_var.set(full_name)
+                self.current_upload_table = full_name
     
-    def refresh_quick_tables(self):
-        """Refresh the quick table selector in upload tab"""
+    def refresh_quick_tables(self, force=False):
+        """Refresh the quick table selector in upload tab (force=True bypasses the table cache)"""
+        if force:
+            # Tables may have been altered too; re-read their columns on next use
+            invalidate_column_cache()
+        
         def refresh():
             try:
-                tables = get_tables_list(self.config_path)
+                tables = self.get_tables_cached(force=force)
                 if tables:
-                    table_names = [full_name for _, _, full_name in tables]
-                    self.quick_table_combo['values'] = table_names
-                    self.available_tables = tables
+                    self.post_message(("tables", tables))
                     self.log_message(f"Refreshed {len(tables)} table(s) in upload tab")
             except Exception as e:
                 self.log_message(f"Error refreshing tables: {e}")
@@ -532,11 +739,20 @@ class DataUploaderGUI:
         """Handle file drop event"""
         try:
             files = self.root.tk.splitlist(event.data)
-            cleaned_files = []
+            # Cheap extension filter first, then stat only the candidates
+            candidates = []
             for f in files:
                 clean_path = f.strip('{}')
-                if os.path.isfile(clean_path) and clean_path.lower().endswith(('.xlsx', '.xls', '.csv')):
-                    cleaned_files.append(clean_path)
+                if clean_path.rpartition('.')[2].casefold() in DROP_EXTENSIONS:
+                    candidates.append(clean_path)
+            
+            if len(candidates) > 16:
+                # Overlap filesystem latency (network shares) for big drops
+                with ThreadPoolExecutor(max_workers=8) as pool:
+                    exists = list(pool.map(os.path.isfile, candidates))
+            else:
+                exists = [os.path.isfile(p) for p in candidates]
+            cleaned_files = [p for p, ok in zip(candidates, exists) if ok]
             
             if cleaned_files:
                 self.add_files_to_selection(cleaned_files)
@@ -564,16 +780,28 @@ class DataUploaderGUI:
             messagebox.showwarning("No Table Selected", "Please select a table first.")
             return
         
+        # Collect first so the listbox and log are each touched once per batch
+        new_names = []
         for file_path in files:
-            if file_path not in self.current_upload_files:
+            # normcase/abspath so C:\Data\a.xlsx and c:/data/A.xlsx count as one file on Windows
+            key = os.path.normcase(os.path.abspath(file_path))
+            if key not in self._selected_files_set:
+                self._selected_files_set.add(key)
                 self.current_upload_files.append(file_path)
-                file_name = Path(file_path).name
-                self.selected_files_listbox.insert(tk.END, file_name)
-                self.log_message(f"Added file: {file_name}")
+                new_names.append(Path(file_path).name)
+        
+        if not new_names:
+            return
+        self.selected_files_listbox.insert(tk.END, *new_names)
+        if len(new_names) == 1:
+            self.log_message(f"Added file: {new_names[0]}")
+        else:
+            self.log_message(f"Added {len(new_names)} files")
     
     def clear_file_selection(self):
         """Clear the current file selection"""
         self.current_upload_files.clear()
+        self._selected_files_set.clear()
         self.selected_files_listbox.delete(0, tk.END)
         self.log_message("Cleared file selection")
     
@@ -593,20 +821,27 @@ class DataUploaderGUI:
                 self.log_message(f"VALIDATING {len(self.current_upload_files)} FILE(S) FOR TABLE: {self.current_upload_table}")
                 self.log_message(f"{'='*80}\n")
                 
-                from validate_and_clean_data import validate_file
+                from validate_and_clean_data import validate_schema_only, TABLE_SCHEMAS
+                
+                # Extract table name from full name (e.g., "DataCleanup.dbo.TransactionsRaw" -> "TransactionsRaw")
+                # and look up its schema once for every file
+                table_parts = self.current_upload_table.split('.')
+                table_name = table_parts[-1].strip('[]')
+                expected_columns = TABLE_SCHEMAS.get(table_name)
+                
+                # One file at a time: header parsing holds the GIL, so threads wouldn't
+                # overlap it, and validate_schema_only's output would interleave
+                files = list(self.current_upload_files)
+                self.log_message(f"Validating {len(files)} file(s)...")
+                prefetch_files(files)
                 
                 all_valid = True
-                for file_path in self.current_upload_files:
-                    file_name = Path(file_path).name
-                    self.log_message(f"Validating: {file_name}...")
-                    
-                    # Extract table name from full name (e.g., "DataCleanup.dbo.TransactionsRaw" -> "TransactionsRaw")
-                    table_parts = self.current_upload_table.split('.')
-                    table_name = table_parts[-1].strip('[]')
-                    
-                    results = validate_file(file_path, table_name)
-                    
+                passed = 0
+                for file_path in files:
+                    results = validate_schema_only(file_path, table_name, expected_columns=expected_columns)
+                    file_name = os.path.basename(file_path)
                     if results['valid']:
+                        passed += 1
                         self.log_message(f"  ✓ {file_name}: PASSED")
                     else:
                         self.log_message(f"  ❌ {file_name}: FAILED")
@@ -616,17 +851,18 @@ class DataUploaderGUI:
                             self.log_message(f"     Extra columns: {', '.join(results['extra_columns'][:5])}")
                         all_valid = False
                 
+                self.log_message(f"{passed} of {len(files)} file(s) passed")
                 self.log_message(f"\n{'='*80}")
                 if all_valid:
                     self.log_message("✓ ALL FILES VALIDATED SUCCESSFULLY!")
-                    self.operation_queue.put(("success", "All files validated successfully!"))
+                    self.post_message(("success", "All files validated successfully!"))
                 else:
                     self.log_message("❌ SOME FILES FAILED VALIDATION")
-                    self.operation_queue.put(("error", "Some files failed validation. Check logs for details."))
+                    self.post_message(("error", "Some files failed validation. Check logs for details."))
                 
             except Exception as e:
                 self.log_message(f"Validation error: {e}")
-                self.operation_queue.put(("error", f"Validation failed: {e}"))
+                self.post_message(("error", f"Validation failed: {e}"))
         
         threading.Thread(target=validate, daemon=True).start()
     
@@ -640,113 +876,172 @@ class DataUploaderGUI:
             messagebox.showwarning("No Files Selected", "Please select files to upload.")
             return
         
+        try:
+            batch_size = max(1, int(self.batch_size_var.get()))
+        except (tk.TclError, ValueError):
+            batch_size = 5000
+        # Insert method ('multi' for the legacy "SQL Server" driver unless "insert_method"
+        # overrides it), optional BULK INSERT share or bcp, and rows per transaction inside a file
+        options = upload_options_from_cfg(self.config)
+        insert_method = options['method']
+        bulk_insert_dir = options['bulk_insert_dir']
+        commit_rows = options['commit_rows']
+        bcp_dbcfg = options['bcp_dbcfg']
+        # Optional "pyarrow" to read into arrow-backed columns (pandas >= 2.0 + pyarrow)
+        dtype_backend = self.config.get('dtype_backend') or None
+        # Larger files are streamed chunk by chunk, so memory stays O(chunk_rows)
+        try:
+            chunked_upload_mb = float(self.config.get('chunked_upload_mb', CHUNKED_UPLOAD_MB))
+            chunk_rows = max(1, int(self.config.get('chunk_rows', CHUNK_ROWS)))
+        except (TypeError, ValueError):
+            chunked_upload_mb, chunk_rows = CHUNKED_UPLOAD_MB, CHUNK_ROWS
+        
+        files = list(self.current_upload_files)
+        table = self.current_upload_table
+        upload_mode = self.upload_mode_var.get()
+        
+        def upload_one(file_path, table_cols, read_future=None, file_size=None, file_mode='append'):
+            """Upload one file. read_future is the file's parse already running in the
+            read pool (small files only), if any. file_mode 'delete' clears the table in
+            the same transaction as the file's first rows."""
+            file_name = os.path.basename(file_path)
+            if file_size is None:
+                file_size = os.path.getsize(file_path)
+            file_size_mb = file_size / (1024 * 1024)
+            self.log_message(f"Processing {file_name} ({file_size_mb:.1f} MB)...")
+            
+            with self._borrow_conn() as conn:
+                # For large files, use chunked processing to avoid loading everything into memory
+                import time
+                start_time = time.time()
+                chunk_size = chunk_rows
+                
+                if file_size_mb > chunked_upload_mb:
+                    # Use chunked processing for large files - MUCH more memory efficient
+                    self.log_message(f"  Using CHUNKED PROCESSING for large file ({file_size_mb:.1f} MB)...")
+                    self.log_message(f"  This reads and uploads in chunks of {chunk_size:,} rows")
+                    self.log_message(f"  This avoids loading the entire file into memory at once")
+                    
+                    from upload_refresh import upload_excel_in_chunks
+                    total_rows = upload_excel_in_chunks(
+                        file_path, 
+                        conn, 
+                        table, 
+                        table_cols, 
+                        upload_mode=file_mode,
+                        chunk_size=chunk_size,
+                        log_callback=self.log_message,
+                        batch_size=batch_size,
+                        method=insert_method,
+                        bulk_insert_dir=bulk_insert_dir,
+                        commit_rows=commit_rows,
+                        bcp_dbcfg=bcp_dbcfg
+                    )
+                    
+                    elapsed = time.time() - start_time
+                    minutes = int(elapsed // 60)
+                    seconds = int(elapsed % 60)
+                    if minutes > 0:
+                        self.log_message(f"  ✓ Uploaded {total_rows:,} rows in {minutes}m {seconds}s (chunked processing)")
+                    else:
+                        self.log_message(f"  ✓ Uploaded {total_rows:,} rows in {seconds}s (chunked processing)")
+                    
+                else:
+                    # Small files - read all at once (faster for small files). Parsing is
+                    # CPU-bound and holds the GIL, so it runs in a worker process if we can
+                    self.log_message(f"  Reading and preparing data (type conversion, column alignment)...")
+                    result = None
+                    if read_future is not None:
+                        try:
+                            result = read_future.result()
+                        except BrokenProcessPool:
+                            self.log_message(f"  (Worker process unavailable; reading in this thread)")
+                    if result is None:
+                        result = read_table_file(file_path, table_cols, dtype_backend)
+                    rows_read, cols_read, df_prepared = result
+                    
+                    self.log_message(f"  ✓ Loaded {rows_read:,} rows, {cols_read} columns")
+                    self.log_message(f"  ✓ Data preparation complete")
+                    
+                    # Upload to table
+                    self.log_message(f"  Starting upload to {table}...")
+                    from upload_refresh import upload_df_to_table
+                    upload_df_to_table(conn, df_prepared, table, 
+                                     upload_mode=file_mode, table_cols=table_cols,
+                                     batch_size=batch_size, method=insert_method,
+                                     bulk_insert_dir=bulk_insert_dir, commit_rows=commit_rows,
+                                     bcp_dbcfg=bcp_dbcfg)
+                    
+                    self.log_message(f"  ✓ Uploaded {len(df_prepared):,} rows from {file_name}")
+        
         def upload():
             try:
-                self.status_var.set("Uploading files...")
-                self.progress_var.set(0)
+                self.post_message(("status", "Uploading files..."))
+                self.post_progress(0)
                 self.log_message(f"\n{'='*80}")
-                self.log_message(f"UPLOADING {len(self.current_upload_files)} FILE(S) TO: {self.current_upload_table}")
+                self.log_message(f"UPLOADING {len(files)} FILE(S) TO: {table}")
                 self.log_message(f"{'='*80}\n")
                 
                 # Connect to database
-                conn = connect_from_cfg(self.config['db'])
-                try:
+                with self._borrow_conn() as conn:
                     # Get table columns for validation
-                    table_cols = get_table_columns(conn, self.current_upload_table)
+                    table_cols = get_table_columns(conn, table)
                     
-                    upload_mode = self.upload_mode_var.get()
-                    self.log_message(f"Upload mode selected: {upload_mode}")
+                    self.log_message(f"Upload mode selected: {upload_mode} ({batch_size:,} rows per batch)")
                     if upload_mode == 'delete':
-                        self.log_message(f"  → Will DELETE existing data, then insert new data")
+                        # The first file clears the table in the same transaction as its
+                        # load, so a file that fails to read or insert leaves the data as it was
+                        self.log_message(f"  → Will DELETE existing data along with the first file, then insert new data")
                     else:
                         self.log_message(f"  → Will APPEND new data to existing data")
-                    
-                    # Process each file
-                    for idx, file_path in enumerate(self.current_upload_files):
-                        file_name = Path(file_path).name
-                        file_size_mb = Path(file_path).stat().st_size / (1024 * 1024)
-                        self.log_message(f"Processing {file_name} ({file_size_mb:.1f} MB)...")
-                        self.root.update_idletasks()  # Update GUI to show message
-                        
-                        # For large files, use chunked processing to avoid loading everything into memory
-                        import time
-                        start_time = time.time()
-                        chunk_size = 25000  # Process 25,000 rows at a time (reduced for better performance)
-                        
-                        if file_size_mb > 50:
-                            # Use chunked processing for large files - MUCH more memory efficient
-                            self.log_message(f"  Using CHUNKED PROCESSING for large file ({file_size_mb:.1f} MB)...")
-                            self.log_message(f"  This reads and uploads in chunks of {chunk_size:,} rows")
-                            self.log_message(f"  This avoids loading the entire file into memory at once")
-                            self.root.update_idletasks()
-                            
-                            from upload_refresh import upload_excel_in_chunks
-                            total_rows = upload_excel_in_chunks(
-                                file_path, 
-                                conn, 
-                                self.current_upload_table, 
-                                table_cols, 
-                                upload_mode=upload_mode,
-                                chunk_size=chunk_size,
-                                log_callback=lambda msg: (self.log_message(msg), self.root.update_idletasks())
-                            )
-                            
-                            elapsed = time.time() - start_time
-                            minutes = int(elapsed // 60)
-                            seconds = int(elapsed % 60)
-                            if minutes > 0:
-                                self.log_message(f"  ✓ Uploaded {total_rows:,} rows in {minutes}m {seconds}s (chunked processing)")
-                            else:
-                                self.log_message(f"  ✓ Uploaded {total_rows:,} rows in {seconds}s (chunked processing)")
-                            self.root.update_idletasks()
-                            
-                        else:
-                            # Small files - read all at once (faster for small files)
-                            file_ext = Path(file_path).suffix.lower()
-                            if file_ext == '.csv':
-                                self.log_message(f"  Reading CSV file...")
-                                self.root.update_idletasks()
-                                df = pd.read_csv(file_path)
-                            else:
-                                # Excel file
-                                self.log_message(f"  Reading Excel file...")
-                                self.root.update_idletasks()
-                                try:
-                                    df = pd.read_excel(file_path, engine='openpyxl')
-                                except Exception as e:
-                                    self.log_message(f"  (Falling back to default reader...)")
-                                    self.root.update_idletasks()
-                                    df = pd.read_excel(file_path)
-                            
-                            elapsed = time.time() - start_time
-                            self.log_message(f"  ✓ Loaded {len(df):,} rows, {len(df.columns)} columns")
-                            self.root.update_idletasks()
-                            
-                            # Prepare DataFrame (align columns, coerce types)
-                            self.log_message(f"  Preparing data (type conversion, column alignment)...")
-                            self.root.update_idletasks()
-                            from upload_refresh import prepare_dataframe_for_table
-                            df_prepared = prepare_dataframe_for_table(df, table_cols, filename=file_name)
-                            self.log_message(f"  ✓ Data preparation complete")
-                            self.root.update_idletasks()
-                            
-                            # Upload to table
-                            self.log_message(f"  Starting upload to {self.current_upload_table}...")
-                            self.root.update_idletasks()
-                            from upload_refresh import upload_df_to_table
-                            upload_df_to_table(conn, df_prepared, self.current_upload_table, 
-                                             upload_mode=upload_mode, table_cols=table_cols)
-                            
-                            self.log_message(f"  ✓ Uploaded {len(df_prepared):,} rows from {file_name}")
-                        self.progress_var.set((idx + 1) * 100 / len(self.current_upload_files))
-                        self.root.update_idletasks()
-                    
-                    self.log_message(f"\n✓ UPLOAD COMPLETED SUCCESSFULLY!")
-                    self.status_var.set("Upload completed!")
-                    self.operation_queue.put(("success", f"Successfully uploaded {len(self.current_upload_files)} file(s)!"))
-                    
+                
+                # Start disk reads for the files uploaded later
+                prefetch_files(files)
+                
+                # Files go into the table one after another (parallel writers to one table
+                # just wait on each other's locks) and the first failure stops the run.
+                # Parsing small files is CPU-bound, so the next few are parsed in worker
+                # processes while the current one inserts.
+                read_ahead = max(1, int(self.config.get('max_parallel_uploads', 4)))
+                file_sizes = {fp: os.path.getsize(fp) for fp in files}
+                small_files = {fp for fp in files
+                               if file_sizes[fp] <= chunked_upload_mb * 1024 * 1024}
+                read_pool = None
+                if len(small_files) > 1:
+                    try:
+                        read_pool = ProcessPoolExecutor(
+                            max_workers=max(1, min(os.cpu_count() or 1, read_ahead, len(small_files))))
+                    except Exception as e:
+                        self.log_message(f"Reading files in-process ({e})")
+                reads = {}
+                try:
+                    for idx, fp in enumerate(files):
+                        if read_pool is not None:
+                            for ahead in files[idx:idx + read_ahead]:
+                                if ahead in small_files and ahead not in reads:
+                                    try:
+                                        reads[ahead] = read_pool.submit(read_table_file, ahead, table_cols,
+                                                                        dtype_backend)
+                                    except BrokenProcessPool:
+                                        break
+                        try:
+                            upload_one(fp, table_cols, reads.pop(fp, None), file_sizes[fp],
+                                       file_mode=upload_mode if idx == 0 else 'append')
+                        except Exception as e:
+                            self.log_message(f"  ✗ {Path(fp).name} failed: {e}")
+                            if upload_mode == 'delete' and idx > 0:
+                                self.log_message(f"  ⚠ {idx} earlier file(s) were already committed to {table}")
+                            raise
+                        self.post_progress((idx + 1) * 100 / len(files))
                 finally:
-                    conn.close()
+                    for future in reads.values():
+                        future.cancel()
+                    if read_pool is not None:
+                        read_pool.shutdown()
+                
+                self.log_message(f"\n✓ UPLOAD COMPLETED SUCCESSFULLY!")
+                self.post_message(("status", "Upload completed!"))
+                self.post_message(("success", f"Successfully uploaded {len(files)} file(s)!"))
                     
             except Exception as e:
                 # Extract more detailed error information
@@ -761,8 +1056,8 @@ class DataUploaderGUI:
                 self.log_message(f"✗ Upload failed!")
                 self.log_message(f"  Error: {error_msg}")
                 self.log_message(f"  Check the console/terminal for detailed error information.")
-                self.status_var.set("Upload failed!")
-                self.operation_queue.put(("error", f"Upload failed: {error_msg}"))
+                self.post_message(("status", "Upload failed!"))
+                self.post_message(("error", f"Upload failed: {error_msg}"))
         
         threading.Thread(target=upload, daemon=True).start()
     
@@ -817,19 +1112,19 @@ class DataUploaderGUI:
                 
                 # Folder name in bold
                 folder_label = tk.Label(info_frame, text=f"📁 {folder}", 
-                                       font=('Arial', 10, 'bold'), bg=bg_color, fg='#333333')
+                                       font=self.font_status, bg=bg_color, fg='#333333')
                 folder_label.pack(anchor='w', pady=(0, 2))
                 
                 # Table name in smaller text
                 table_label = tk.Label(info_frame, text=f"Table: {target_table}", 
-                                      font=('Arial', 8), bg=bg_color, fg='#666666')
+                                      font=self.font_small, bg=bg_color, fg='#666666')
                 table_label.pack(anchor='w')
                 
                 # Middle: Upload mode dropdown
                 mode_frame = tk.Frame(row_frame, bg=bg_color)
                 mode_frame.pack(side='left', padx=10, pady=8)
                 
-                mode_label = tk.Label(mode_frame, text="Mode:", font=('Arial', 9, 'bold'), 
+                mode_label = tk.Label(mode_frame, text="Mode:", font=self.font_label_bold, 
                                      bg=bg_color, fg='#333333')
                 mode_label.pack()
                 
@@ -849,7 +1144,7 @@ class DataUploaderGUI:
                 
                 file_label_var = tk.StringVar(value="No file")
                 file_status_label = tk.Label(button_frame, textvariable=file_label_var, 
-                                            font=('Arial', 8), bg=bg_color, fg='#999999')
+                                            font=self.font_small, bg=bg_color, fg='#999999')
                 file_status_label.pack(pady=(0, 3))
                 
                 def select_file_for_folder(f=folder, label_var=file_label_var):
@@ -867,7 +1162,7 @@ class DataUploaderGUI:
                 
                 select_btn = tk.Button(button_frame, text="📂 Select File", 
                                       command=select_file_for_folder,
-                                      bg='#007bff', fg='white', font=('Arial', 8, 'bold'),
+                                      bg='#007bff', fg='white', font=self.font_small_bold,
                                       padx=10, pady=4, relief='flat', cursor='hand2',
                                       activebackground='#0056b3', activeforeground='white')
                 select_btn.pack()
@@ -880,6 +1175,7 @@ class DataUploaderGUI:
         """Update upload mode for a specific folder"""
         if folder in self.table_configs:
             self.table_configs[folder]['upload_mode'] = mode
+            self._config_dirty = True
             self.log_message(f"Updated upload mode for {folder} to: {mode}")
     
     def _on_mousewheel(self, event):
@@ -897,9 +1193,10 @@ class DataUploaderGUI:
             self.sql_listbox.delete(0, tk.END)
             base = Path(__file__).parent.resolve()
             sql_files = list_sql_files(base)
-            
-            for sql_file in sql_files:
-                self.sql_listbox.insert(tk.END, sql_file)
+            # The listbox rows, by index; running scripts reads this, not the disk
+            self._sql_files = list(sql_files)
+            if sql_files:
+                self.sql_listbox.insert(tk.END, *sql_files)
             
             self.log_message(f"Found {len(sql_files)} SQL scripts")
         except Exception as e:
@@ -961,22 +1258,24 @@ class DataUploaderGUI:
             try:
                 self.log_message(f"Validating {len(files_to_validate)} file(s)...\n")
                 
-                from validate_and_clean_data import validate_file
+                # Only the header decides pass/fail, so skip reading data rows
+                from validate_and_clean_data import validate_schema_only
                 
                 all_valid = True
                 validation_results = {}
                 
                 for folder, file_path in files_to_validate.items():
-                    self.log_message(f"Validating {Path(file_path).name} for {folder}...")
+                    file_name = os.path.basename(file_path)
+                    self.log_message(f"Validating {file_name} for {folder}...")
                     # Use the target_table from config
                     table_name = self.table_configs[folder]['target_table']
-                    results = validate_file(file_path, table_name)
+                    results = validate_schema_only(file_path, table_name)
                     validation_results[folder] = results
                     
                     if results['valid']:
-                        self.log_message(f"  ✓ {Path(file_path).name}: PASSED")
+                        self.log_message(f"  ✓ {file_name}: PASSED")
                     else:
-                        self.log_message(f"  ❌ {Path(file_path).name}: FAILED")
+                        self.log_message(f"  ❌ {file_name}: FAILED")
                         if results['missing_columns']:
                             self.log_message(f"     Missing: {', '.join(results['missing_columns'][:3])}...")
                         if results['extra_columns']:
@@ -1018,9 +1317,10 @@ class DataUploaderGUI:
                 failed_files = []
                 
                 for folder, file_path in files_to_validate.items():
-                    output_path = str(Path(file_path).parent / f"{Path(file_path).stem}_cleaned.xlsx")
+                    path = Path(file_path)
+                    output_path = str(path.with_name(f"{path.stem}_cleaned.xlsx"))
                     
-                    self.log_message(f"Fixing {Path(file_path).name}...")
+                    self.log_message(f"Fixing {path.name}...")
                     
                     try:
                         # Use the target_table from config
@@ -1035,7 +1335,7 @@ class DataUploaderGUI:
                             self.log_message(f"  ❌ Could not fix: {file_path}")
                     except Exception as e:
                         failed_files.append(file_path)
-                        self.log_message(f"  ❌ Error fixing {Path(file_path).name}: {e}")
+                        self.log_message(f"  ❌ Error fixing {path.name}: {e}")
                 
                 self.log_message("\n" + "="*80)
                 
@@ -1057,160 +1357,204 @@ class DataUploaderGUI:
 
     def start_upload(self):
         """Start the upload process with per-table configurations"""
+        self.log_message("Starting upload process...")
+        
+        # Snapshot the per-table selections here: Tk variables belong to the UI thread.
+        # Selected files are read where they are (no copy into inbound/).
+        selected = {}
+        modes = {}
+        for folder, config in self.table_configs.items():
+            # Skip if this table is not enabled
+            if not config['enabled'].get():
+                self.log_message(f"Skipping {folder} (unchecked)")
+                continue
+            
+            upload_mode = config['upload_mode']
+            selected_file = config['file']
+            
+            # If a specific file was selected for this table, use it
+            if selected_file and os.path.exists(selected_file):
+                selected[folder] = [selected_file]
+                modes[folder] = upload_mode
+                self.log_message(f"Queued {os.path.basename(selected_file)} for {folder} with mode: {upload_mode}")
+        
+        files_uploaded = len(selected)
+        if files_uploaded == 0:
+            self.log_message("No files selected for upload. Please select a file for at least one enabled table.")
+            self.status_var.set("No files selected")
+            return
+        
+        self.status_var.set("Uploading files...")
+        self.progress_var.set(0)
+        
         def upload_process():
+            # Status and progress reach Tk only through the UI queue
             try:
-                self.status_var.set("Uploading files...")
-                self.progress_var.set(0)
-                self.log_message("Starting upload process...")
-                
-                base = Path(__file__).parent.resolve()
-                inbound_base = base / 'inbound'
-                inbound_base.mkdir(exist_ok=True)
-                
-                # Process files based on per-table selections and upload modes
-                files_uploaded = 0
-                
-                for folder, config in self.table_configs.items():
-                    # Skip if this table is not enabled
-                    if not config['enabled'].get():
-                        self.log_message(f"Skipping {folder} (unchecked)")
-                        continue
-                    
-                    upload_mode = config['upload_mode']
-                    selected_file = config['file']
-                    
-                    # If a specific file was selected for this table, use it
-                    if selected_file and Path(selected_file).exists():
-                        # Extract just the folder name from the path (e.g., "ActiveInsurance" from "inbound/ActiveInsurance")
-                        folder_name = Path(folder).name
-                        target_folder_path = inbound_base / folder_name
-                        target_folder_path.mkdir(exist_ok=True)
-                        
-                        file_name = Path(selected_file).name
-                        dest_file = target_folder_path / file_name
-                        
-                        try:
-                            shutil.copy2(selected_file, dest_file)
-                            self.log_message(f"Copied {file_name} to {folder} with mode: {upload_mode}")
-                            files_uploaded += 1
-                        except Exception as e:
-                            self.log_message(f"Error copying {file_name}: {e}")
-                            if self.stop_on_error_var.get():
-                                raise
-                
-                if files_uploaded == 0:
-                    self.log_message("No files selected for upload. Please select a file for at least one enabled table.")
-                    self.status_var.set("No files selected")
-                    return
-                
-                # Update config with per-folder upload modes
-                for folder_config in self.config.get('folders', []):
-                    folder = folder_config.get('folder', '')
-                    if folder in self.table_configs:
-                        # Clean up old format
-                        if 'truncate_before_load' in folder_config:
-                            del folder_config['truncate_before_load']
-                        # Update with current mode
-                        folder_config['upload_mode'] = self.table_configs[folder]['upload_mode']
-                
-                # Save updated config
-                with open(self.config_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.config, f, indent=2)
-                
-                # Run upload
-                self.progress_var.set(50)
+                # Modes are passed straight to the upload; config.json is not needed for them
+                self.post_progress(50)
                 self.log_message(f"Running database upload for {files_uploaded} file(s)...")
-                upload_from_folders(self.config_path)
+                with self._borrow_conn() as conn:
+                    upload_from_folders(self.config_path, files=selected, upload_modes=modes, conn=conn)
                 
-                self.progress_var.set(100)
-                self.status_var.set("Upload completed successfully!")
+                self.post_progress(100)
+                self.post_message(("status", "Upload completed successfully!"))
                 self.log_message("✓ Upload process completed successfully!")
-                self.operation_queue.put(("success", "Upload completed successfully!"))
+                self.post_message(("success", "Upload completed successfully!"))
                 
             except Exception as e:
-                self.status_var.set("Upload failed!")
+                self.post_message(("status", "Upload failed!"))
                 self.log_message(f"✗ Upload failed: {e}")
-                self.operation_queue.put(("error", f"Upload failed: {e}"))
+                self.post_message(("error", f"Upload failed: {e}"))
+            finally:
+                self.persist_upload_modes()
         
         threading.Thread(target=upload_process, daemon=True).start()
     
+    def persist_upload_modes(self):
+        """Remember the per-folder upload modes in config.json, writing only if one changed"""
+        # Modes only change through _update_upload_mode, which sets the flag
+        if not self._config_dirty:
+            return
+        changed = False
+        for folder_config in self.config.get('folders', []):
+            folder = folder_config.get('folder', '')
+            if folder in self.table_configs:
+                # Clean up old format
+                if 'truncate_before_load' in folder_config:
+                    del folder_config['truncate_before_load']
+                    changed = True
+                # Update with current mode
+                mode = self.table_configs[folder]['upload_mode']
+                if folder_config.get('upload_mode') != mode:
+                    folder_config['upload_mode'] = mode
+                    changed = True
+        if not changed:
+            # e.g. a mode switched away and back again
+            self._config_dirty = False
+            return
+        try:
+            write_file_atomic(self.config_path, json_dumps_pretty(self.config))
+            self._config_dirty = False
+        except Exception as e:
+            self.log_message(f"Could not save upload modes to config: {e}")
+    
     def find_matching_folder(self, filename):
         """Find the appropriate folder for a file based on filename patterns"""
         filename_lower = filename.lower()
-        
-        # Define mapping patterns
-        patterns = {
-            'ActiveInsurance': ['active', 'insurance'],
-            'AriaData': ['aria'],
-            'AtRisk': ['atrisk', 'at-risk', 'risk'],
-            'Fractions': ['fraction'],
-            'ICD_Crosswalk': ['icd', 'crosswalk'],
-            'PatientDOB': ['patient', 'dob', 'birth'],
-            'PayerCrosswalk': ['payer', 'crosswalk'],
-            'ReferralRaw': ['referral'],
-            'ResearchPateint': ['research', 'patient'],
-            'TransactionsRaw': ['transaction']
-        }
-        
-        for folder_name, keywords in patterns.items():
-            if any(keyword in filename_lower for keyword in keywords):
-                return folder_name
+        for folder_name, keywords in _FOLDER_PATTERNS:
+            for keyword in keywords:
+                if keyword in filename_lower:
+                    return folder_name
         return None
     
     def run_selected_sql(self):
         """Run selected SQL scripts"""
-        selected = self.sql_listbox.curselection()
+        self._run_sql_files(self.sql_listbox.curselection())
+    
+    def run_all_sql(self):
+        """Run all SQL scripts"""
+        # Pass every index directly instead of selecting all rows in the listbox
+        self._run_sql_files(range(self.sql_listbox.size()))
+    
+    def _run_sql_files(self, indices):
+        """Run the SQL scripts at the given listbox indices, in order"""
+        selected = list(indices)
         if not selected:
             messagebox.showwarning("No Selection", "Please select SQL scripts to run.")
             return
+        upload_first = self.upload_before_sql_var.get()
+        selected_files = [self._sql_files[i] for i in selected]
         
         def run_sql_process():
             try:
                 self.log_message("Starting SQL script execution...")
                 
-                # Get selected files
                 base = Path(__file__).parent.resolve()
-                sql_files = list_sql_files(base)
-                selected_files = [sql_files[i] for i in selected]
-                
-                # Run upload first if requested
-                if self.upload_before_sql_var.get():
-                    self.log_message("Uploading files before SQL execution...")
-                    upload_from_folders(self.config_path)
                 
-                # Run SQL scripts
-                run_sql_scripts([str(base / f) for f in selected_files], self.config_path)
+                # One connection for the optional upload and the scripts; not returned to
+                # the pool afterwards since scripts may change session state (USE, SET ...)
+                with self._borrow_conn(reuse=False) as conn:
+                    # Run upload first if requested
+                    if upload_first:
+                        self.log_message("Uploading files before SQL execution...")
+                        upload_from_folders(self.config_path, conn=conn)
+                    
+                    # Run SQL scripts
+                    run_sql_scripts([str(base / f) for f in selected_files], self.config_path, conn=conn)
                 self.log_message("✓ SQL scripts executed successfully!")
-                self.operation_queue.put(("success", "SQL scripts executed successfully!"))
+                self.post_message(("success", "SQL scripts executed successfully!"))
                 
             except Exception as e:
                 self.log_message(f"✗ SQL execution failed: {e}")
-                self.operation_queue.put(("error", f"SQL execution failed: {e}"))
+                self.post_message(("error", f"SQL execution failed: {e}"))
         
         threading.Thread(target=run_sql_process, daemon=True).start()
     
-    def run_all_sql(self):
-        """Run all SQL scripts"""
-        self.sql_listbox.selection_set(0, tk.END)
-        self.run_selected_sql()
-    
     def log_message(self, message):
         """Add message to log"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        
-        # Check if log_text widget exists and insert message
-        if hasattr(self, 'log_text'):
-            self.log_text.insert(tk.END, log_entry)
-            self.log_text.see(tk.END)
-            self.root.update_idletasks()
-        else:
-            # Fallback to print if widget not ready
-            print(log_entry, end='')
+        timestamp = _log_timestamp()
+        # Safe from any thread: the Tk widget is only touched by check_queue
+        self.log_queue.put_nowait((timestamp, str(message)))
+        self.notify_ui()
+    
+    def post_message(self, item):
+        """Queue a ("success"|"error", message) dialog, a ("status", text) /
+        ("progress", percent) update or a ("tables", table list) for the UI thread"""
+        self.operation_queue.put(item)
+        self.notify_ui()
+    
+    def post_progress(self, percent):
+        """Queue a progress-bar update; intermediate values closer together than
+        PROGRESS_MIN_INTERVAL are dropped (0 and 100 always go through)"""
+        if 0 < percent < 100:
+            now = time.monotonic()
+            if now - self._progress_posted_at < PROGRESS_MIN_INTERVAL:
+                return
+            self._progress_posted_at = now
+        self.post_message(("progress", percent))
+    
+    def notify_ui(self):
+        """Wake the Tk thread to drain the queues; bursts collapse into one event"""
+        if self._drain_pending:
+            return
+        self._drain_pending = True
+        try:
+            self.root.event_generate('<<QueueEvent>>', when='tail')
+        except (tk.TclError, RuntimeError):
+            # Window is gone (or not ready); nothing left to update
+            self._drain_pending = False
+    
+    def flush_log_queue(self, limit=256):
+        """Move up to `limit` pending log messages into the log view, dropping the oldest rows"""
+        if not hasattr(self, 'log_tree'):
+            return
+        items = []
+        try:
+            while len(items) < limit:
+                items.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not items:
+            return
+        self._log_flushed_at = time.monotonic()
+        rows = [(timestamp, line) for timestamp, message in items for line in message.split('\n')]
+        # Only the newest LOG_MAX_LINES rows can survive; never insert rows just to delete them
+        if len(rows) > LOG_MAX_LINES:
+            del rows[:-LOG_MAX_LINES]
+        overflow = len(self._log_row_ids) + len(rows) - LOG_MAX_LINES
+        if overflow > 0:
+            self.log_tree.delete(*[self._log_row_ids.popleft() for _ in range(overflow)])
+        self._log_ring.extend(rows)
+        insert = self.log_tree.insert
+        self._log_row_ids.extend(insert('', 'end', values=row) for row in rows)
+        self.log_tree.see(self._log_row_ids[-1])
     
     def clear_logs(self):
-        """Clear the log text area"""
-        self.log_text.delete(1.0, tk.END)
+        """Clear the log view"""
+        self._log_ring.clear()
+        if self._log_row_ids:
+            self.log_tree.delete(*self._log_row_ids)
+            self._log_row_ids.clear()
     
     def save_logs(self):
         """Save logs to file"""
@@ -1221,25 +1565,55 @@ class DataUploaderGUI:
             )
             if filename:
                 with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(self.log_text.get(1.0, tk.END))
+                    f.writelines(f"[{ts}] {line}\n" for ts, line in self._log_ring)
                 self.log_message("Logs saved successfully")
         except Exception as e:
             self.log_message(f"Error saving logs: {e}")
     
-    def check_queue(self):
-        """Check for messages from background threads"""
+    def check_queue(self, event=None):
+        """Drain messages from background threads (runs on <<QueueEvent>>)"""
+        self._drain_pending = False
+        # Only the newest status/progress of a drain is drawn
+        latest = {}
         try:
             while True:
                 msg_type, message = self.operation_queue.get_nowait()
-                if msg_type == "success":
+                if msg_type in ("status", "progress"):
+                    latest[msg_type] = message
+                    continue
+                self._apply_status(latest)
+                if msg_type == "tables":
+                    self.show_tables(message)
+                elif msg_type == "success":
                     messagebox.showinfo("Success", message)
                 elif msg_type == "error":
                     messagebox.showerror("Error", message)
         except queue.Empty:
             pass
-        
-        # Schedule next check
-        self.root.after(100, self.check_queue)
+        self._apply_status(latest)
+        
+        # Render log lines at most once per LOG_REFRESH_MS
+        wait_ms = LOG_REFRESH_MS - int((time.monotonic() - self._log_flushed_at) * 1000)
+        if wait_ms > 0:
+            if not self._log_flush_scheduled and not self.log_queue.empty():
+                self._log_flush_scheduled = True
+                self.root.after(wait_ms, self._scheduled_log_flush)
+            return
+        self.flush_log_queue()
+        if not self.log_queue.empty():
+            # More lines than one batch; come back for the rest
+            self.notify_ui()
+    
+    def _apply_status(self, latest):
+        """Push coalesced status/progress values to their Tk variables"""
+        if "status" in latest:
+            self.status_var.set(latest.pop("status"))
+        if "progress" in latest:
+            self.progress_var.set(latest.pop("progress"))
+    
+    def _scheduled_log_flush(self):
+        self._log_flush_scheduled = False
+        self.check_queue()
 
 
 def main():
@@ -11,14 +11,16 @@ from pathlib import Path
 current_dir = Path(__file__).parent.resolve()
 sys.path.insert(0, str(current_dir))
 
-try:
-    from data_uploader_gui import main
-    main()
-except ImportError as e:
-    print(f"Error: {e}")
-    print("\nPlease install required dependencies:")
-    print("pip install -r requirements.txt")
-    input("\nPress Enter to exit...")
-except Exception as e:
-    print(f"Unexpected error: {e}")
-    input("\nPress Enter to exit...")
+# Guarded so worker processes (which re-import the main module on Windows) don't open a GUI
+if __name__ == '__main__':
+    try:
+        from data_uploader_gui import main
+        main()
+    except ImportError as e:
+        print(f"Error: {e}")
+        print("\nPlease install required dependencies:")
+        print("pip install -r requirements.txt")
+        input("\nPress Enter to exit...")
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+        input("\nPress Enter to exit...")
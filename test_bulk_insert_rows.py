@@ -0,0 +1,61 @@
+"""Call-shape tests for upload_refresh.bulk_insert_rows (no database needed)
+
+Run with: python -m unittest test_bulk_insert_rows
+"""
+import inspect
+import unittest
+
+from upload_refresh import bulk_insert_rows
+
+try:
+    import mssql_python
+except ImportError:
+    mssql_python = None
+
+
+class FakeCursor:
+    """Records bulkcopy/executemany calls instead of talking to SQL Server"""
+
+    def __init__(self):
+        self.calls = []
+        self.fast_executemany = False
+
+    def bulkcopy(self, *args, **kwargs):
+        self.calls.append(('bulkcopy', args, kwargs))
+
+    def executemany(self, *args, **kwargs):
+        self.calls.append(('executemany', args, kwargs))
+
+
+ROWS = [(1, 'a'), (2, None)]
+SQL = "INSERT INTO DataCleanup.dbo.[Payer Crosswalk] ([Id], [Name]) VALUES (?, ?)"
+
+
+class BulkInsertRowsTest(unittest.TestCase):
+    def test_bulkcopy_call_shape(self):
+        cursor = FakeCursor()
+        bulk_insert_rows(cursor, SQL, 'DataCleanup.dbo.[Payer Crosswalk]', ['Id', 'Name'], ROWS,
+                         method='bulkcopy')
+        self.assertEqual(cursor.calls, [(
+            'bulkcopy',
+            ('[dbo].[Payer Crosswalk]', ROWS),
+            {'timeout': 0, 'column_mappings': ['Id', 'Name'], 'keep_nulls': True},
+        )])
+
+    @unittest.skipIf(mssql_python is None, 'mssql-python is not installed')
+    def test_bulkcopy_call_matches_installed_driver(self):
+        cursor = FakeCursor()
+        bulk_insert_rows(cursor, SQL, 'dbo.T', ['Id', 'Name'], ROWS, method='bulkcopy')
+        _, args, kwargs = cursor.calls[0]
+        # Raises TypeError if the installed driver's bulkcopy() doesn't take these arguments
+        inspect.signature(mssql_python.Cursor.bulkcopy).bind(object(), *args, **kwargs)
+
+    def test_fast_uses_executemany_even_if_bulkcopy_exists(self):
+        cursor = FakeCursor()
+        bulk_insert_rows(cursor, SQL, 'dbo.T', ['Id', 'Name'], ROWS)
+        self.assertTrue(cursor.fast_executemany)
+        self.assertEqual(cursor.calls, [('executemany', (SQL, ROWS), {})])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,30 +23,203 @@ import os
 import json
 import argparse
 import re
+import fnmatch
 import sys
 import tempfile
+import shutil
+import subprocess
 import csv
+import threading
+import time
+import queue
+import importlib
+import importlib.util
+import functools
+import itertools
+import operator
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import date as date_type
 
+
+class _LazyModule:
+    """Stand-in for an installed but heavy module; the real import happens on
+    first attribute access, so importing this file (e.g. from the GUI) stays fast."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
+
+
+def _lazy_import(name):
+    """A _LazyModule for `name` if it is installed, else None (like a failed optional import)"""
+    try:
+        found = importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        found = False
+    return _LazyModule(name) if found else None
+
+
+# pandas (and numpy/pyarrow below) take hundreds of ms to import; defer until used
+pd = _lazy_import('pandas')
+
+# pyodbc loads the ODBC driver manager on import; defer that to the first connect
+pyodbc = _lazy_import('pyodbc')
+
 try:
-    import pandas as pd
+    # Optional: Microsoft's mssql-python driver exposes a native TDS bulk copy
+    import mssql_python
 except Exception:
-    pd = None
+    mssql_python = None
 
 try:
-    import pyodbc
+    # Optional: Rust Excel parser, several times faster than openpyxl.
+    # pandas >= 2.2 exposes it as read_excel(engine='calamine').
+    import python_calamine
 except Exception:
-    pyodbc = None
+    python_calamine = None
 
 try:
-    from difflib import SequenceMatcher
+    # Optional: streaming xlsx -> CSV converter, much faster than openpyxl on big sheets
+    from xlsx2csv import Xlsx2csv
 except Exception:
-    SequenceMatcher = None
+    Xlsx2csv = None
 
 try:
-    import numpy as np
+    # Optional: orjson parses/serializes JSON several times faster than the stdlib
+    import orjson
 except Exception:
-    np = None
+    orjson = None
+
+# Optional: arrow-backed DataFrame columns (read_excel/read_csv dtype_backend='pyarrow')
+pyarrow = _lazy_import('pyarrow')
+
+try:
+    from difflib import SequenceMatcher
+except Exception:
+    SequenceMatcher = None
+
+np = _lazy_import('numpy')
+
+
+def excel_engine():
+    """Return 'calamine' when python-calamine is installed and pandas supports it, else None"""
+    if python_calamine is None or pd is None:
+        return None
+    try:
+        major, minor = (int(x) for x in pd.__version__.split('.')[:2])
+    except ValueError:
+        return None
+    return 'calamine' if (major, minor) >= (2, 2) else None
+
+
+def dtype_backend_kwargs(dtype_backend=None):
+    """
+    Reader kwargs for the configured dtype_backend ('pyarrow' or 'numpy_nullable').
+    Empty when unset, when pandas < 2.0, or when 'pyarrow' is asked for without pyarrow.
+    """
+    if not dtype_backend or pd is None:
+        return {}
+    try:
+        major = int(pd.__version__.split('.')[0])
+    except ValueError:
+        return {}
+    if major < 2 or (dtype_backend == 'pyarrow' and pyarrow is None):
+        return {}
+    return {'dtype_backend': dtype_backend}
+
+
+def read_excel_fast(path, dtype_backend=None, **kwargs):
+    """pd.read_excel on the first sheet, using calamine when available (openpyxl otherwise).
+    dtype_backend='pyarrow' reads into arrow-backed columns when supported."""
+    backend = dtype_backend_kwargs(dtype_backend)
+    if backend:
+        try:
+            return _read_excel(path, **backend, **kwargs)
+        except Exception as e:
+            print(f"Could not read {Path(path).name} with dtype_backend={dtype_backend} ({e}); using default dtypes")
+    return _read_excel(path, **kwargs)
+
+
+def _read_excel(path, **kwargs):
+    engine = excel_engine()
+    if engine:
+        try:
+            return pd.read_excel(path, engine=engine, sheet_name=0, **kwargs)
+        except Exception as e:
+            print(f"calamine could not read {Path(path).name} ({e}); falling back to default reader")
+    return pd.read_excel(path, **kwargs)
+
+
+def prefetch_files(paths):
+    """
+    Ask the OS to start reading files into the page cache in the background
+    (posix_fadvise WILLNEED), so later reads of a batch of files overlap their
+    disk I/O. No-op where posix_fadvise is unavailable (e.g. Windows).
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for path in paths:
+        try:
+            fd = os.open(str(path), os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def json_loads(data):
+    """Parse JSON from bytes or str (orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """Serialize to compact JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def json_dumps_pretty(obj):
+    """Serialize to 2-space indented JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+# load_cfg results: {path: (st_mtime_ns, st_size, cfg)}
+_cfg_cache = {}
+_cfg_cache_lock = threading.Lock()
+
+
+def load_cfg(cfg_path):
+    """Parse config.json, reusing the last result while the file is unchanged (same
+    mtime and size). The returned dict is shared between callers; don't modify it."""
+    st = os.stat(cfg_path)
+    key = os.fspath(cfg_path)
+    with _cfg_cache_lock:
+        cached = _cfg_cache.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    with open(cfg_path, 'rb') as fh:
+        cfg = json_loads(fh.read())
+    with _cfg_cache_lock:
+        _cfg_cache[key] = (st.st_mtime_ns, st.st_size, cfg)
+    return cfg
 
 
 def convert_numpy_to_python(val):
@@ -78,12 +251,97 @@ def convert_numpy_to_python(val):
     return val
 
 
+def columnar_rows(df, col_data_types=None, col_max_lengths=None):
+    """
+    Build insert rows column-wise when every column's dtype maps straight onto its
+    SQL type: plain numbers (or bools bound for a BIT column), pandas string columns
+    bound for a text column and within its width, and datetime64 columns bound for
+    DATE/DATETIME columns. Series.tolist() already yields Python objects, so no
+    per-value conversion is needed. Returns an iterator of row tuples, or None if
+    any column needs the general per-value path (object columns, decimals, ...).
+    """
+    col_data_types = col_data_types or {}
+    col_max_lengths = col_max_lengths or {}
+    ptypes = pd.api.types
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        dtype = series.dtype
+        sql_type = col_data_types.get(col, '')
+        if ptypes.is_datetime64_any_dtype(dtype):
+            values = _datetime_column_values(series, sql_type)
+            if values is None:
+                return None
+            columns.append(values)
+            continue
+        # pandas string columns: "string" (StringDtype) or pandas 3's default "str";
+        # object columns may hold anything, so they take the general path
+        if dtype != object and ptypes.is_string_dtype(dtype):
+            if sql_type and sql_type_to_coercion(sql_type) != 'str':
+                return None
+            max_len = col_max_lengths.get(col)
+            if max_len and (series.str.len() > max_len).any():
+                return None  # the general path truncates (and reports) these
+        elif not ptypes.is_numeric_dtype(dtype) or 'date' in sql_type or 'time' in sql_type:
+            return None
+        elif 'bit' in sql_type and not ptypes.is_bool_dtype(dtype):
+            return None
+        if series.hasnans:
+            # One pass per column: object values with NaN/NA already replaced by None
+            columns.append(series.to_numpy(dtype=object, na_value=None).tolist())
+        else:
+            columns.append(series.tolist())
+    return zip(*columns)
+
+
+# SQL Server DATETIME range; values outside it are sent as NULL
+SQL_DATETIME_MIN = '1753-01-01'
+SQL_DATETIME_MAX = '9999-12-31 23:59:59'
+
+
+def _datetime_column_values(series, sql_type):
+    """Python date/datetime values (None for NaT) of a datetime64 column, or None
+    if the target type isn't DATE/DATETIME or the column is timezone-aware"""
+    if getattr(series.dtype, 'tz', None) is not None:
+        return None
+    if sql_type == 'date':
+        return series.dt.date.where(series.notna(), None).tolist()
+    if sql_type in ('datetime', 'datetime2', 'smalldatetime'):
+        in_range = series.notna() & (series >= pd.Timestamp(SQL_DATETIME_MIN)) & (series <= pd.Timestamp(SQL_DATETIME_MAX))
+        return [v.to_pydatetime() if ok else None for v, ok in zip(series.tolist(), in_range.tolist())]
+    return None
+
+
+# list_sql_files results: {directory: (mtime_ns, names)}
+_sql_files_cache = {}
+
+
 def list_sql_files(base: Path):
-    return sorted([p.name for p in base.glob('*.sql')])
+    """Sorted names of the .sql files in base. The listing is cached until the
+    directory's mtime changes (files added, removed or renamed)."""
+    key = os.path.abspath(base)
+    mtime = os.stat(key).st_mtime_ns
+    cached = _sql_files_cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1])
+    # normcase: *.sql matches case-insensitively on Windows, like glob did
+    names = sorted(e.name for e in os.scandir(key)
+                   if os.path.normcase(e.name).endswith('.sql') and e.is_file())
+    # A change within the filesystem's timestamp resolution could keep the same
+    # mtime, so only trust listings of directories that have been quiet a while
+    if time.time_ns() - mtime > 2_000_000_000:
+        _sql_files_cache[key] = (mtime, tuple(names))
+    return names
+
+
+# Characters not allowed in Windows file names
+_UNSAFE_DIRNAME_RE = re.compile(r'[\\/*?:"<>|]')
+# Length in a type string such as "NVARCHAR(255)"
+_TYPE_LENGTH_RE = re.compile(r'\((\d+)\)')
 
 
 def safe_dirname(name: str) -> str:
-    return re.sub(r'[\\/*?:"<>|]', '_', name)
+    return _UNSAFE_DIRNAME_RE.sub('_', name)
 
 
 def create_inbound_dirs(sql_files, base: Path):
@@ -135,103 +393,209 @@ def write_template_config(sql_files, folders, path: Path):
             "file_patterns": ["*.xlsx", "*.xls"],
             "upload_mode": "append"  # options: 'append', 'delete'
         })
-    with open(path, 'w', encoding='utf-8') as fh:
-        json.dump(cfg, fh, indent=2)
+    with open(path, 'wb') as fh:
+        fh.write(json_dumps_pretty(cfg))
     print(f"Template config written to {path}. Edit target_table entries before uploading.")
 
 
 def connect_from_cfg(dbcfg: dict):
+    client = dbcfg.get('client', 'pyodbc')
+    if client == 'mssql-python':
+        return connect_mssql_python(dbcfg)
     if pyodbc is None:
         raise SystemExit("pyodbc is not installed. Install with: pip install pyodbc")
-    driver = dbcfg.get('driver', 'ODBC Driver 17 for SQL Server')
+    conn_str = odbc_connection_string(
+        dbcfg.get('driver', 'ODBC Driver 17 for SQL Server'), dbcfg.get('server'), dbcfg.get('database'),
+        bool(dbcfg.get('trusted_connection', True)), dbcfg.get('username'), dbcfg.get('password'))
+    return pyodbc.connect(conn_str, autocommit=False)
+
+
+def odbc_connection_string(driver, server, database, trusted=True, user=None, pwd=None):
+    """Build the pyodbc connection string for connect_from_cfg (not cached: it would
+    keep SQL passwords in memory for the life of the process)"""
+    if not server or not database:
+        raise ValueError('server and database must be set in config db section')
+    if trusted:
+        return f"DRIVER={{{driver}}};SERVER={server};DATABASE={database};Trusted_Connection=yes;"
+    if not user or not pwd:
+        raise ValueError('username and password required when trusted_connection is False')
+    return f"DRIVER={{{driver}}};SERVER={server};DATABASE={database};UID={user};PWD={pwd}"
+
+
+def connect_mssql_python(dbcfg: dict):
+    """
+    Connect with mssql-python instead of pyodbc (opt in with "client": "mssql-python"
+    in the config db section). Its cursors support bulkcopy(), which streams rows to
+    SQL Server as a TDS bulk load instead of parameterized INSERT statements.
+    """
+    if mssql_python is None:
+        raise SystemExit("mssql-python is not installed. Install with: pip install mssql-python")
     server = dbcfg.get('server')
     database = dbcfg.get('database')
-    trusted = dbcfg.get('trusted_connection', True)
     if not server or not database:
         raise ValueError('server and database must be set in config db section')
-    if trusted:
-        conn_str = f"DRIVER={{{driver}}};SERVER={server};DATABASE={database};Trusted_Connection=yes;"
-        return pyodbc.connect(conn_str, autocommit=False)
+    if dbcfg.get('trusted_connection', True):
+        conn_str = f"SERVER={server};DATABASE={database};Trusted_Connection=yes;"
     else:
         user = dbcfg.get('username')
         pwd = dbcfg.get('password')
         if not user or not pwd:
             raise ValueError('username and password required when trusted_connection is False')
-        conn_str = f"DRIVER={{{driver}}};SERVER={server};DATABASE={database};UID={user};PWD={pwd}"
-        return pyodbc.connect(conn_str, autocommit=False)
+        conn_str = f"SERVER={server};DATABASE={database};UID={user};PWD={pwd}"
+    return mssql_python.connect(conn_str, autocommit=False)
+
 
+# Idle connections kept per connection settings (see pooled_connection)
+CONN_POOL_SIZE = 8
+# Pooled connections idle longer than this are checked with SELECT 1 before reuse
+CONN_IDLE_CHECK_SECS = 60
+# Rows per fetchmany() block for catalog listings
+METADATA_FETCH_ROWS = 10000
+# {settings key: Queue of (connection, time.monotonic() when it was returned)}
+_conn_pools = {}
+_conn_pools_lock = threading.Lock()
 
-def test_connection(cfg_path: Path):
-    """Attempt a DB connection using config and print basic server/user info."""
-    cfg = json.load(open(cfg_path, 'r', encoding='utf-8'))
+
+def _close_quietly(conn):
     try:
-        conn = connect_from_cfg(cfg['db'])
-    except Exception as e:
-        print('Connection failed:', e)
-        return 1
+        conn.close()
+    except Exception:
+        pass
+
+
+def _conn_alive(conn):
+    """Cheap liveness check for a connection that sat idle in the pool"""
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        cur.fetchall()
+        cur.close()
+        return True
+    except Exception:
+        return False
+
+
+@contextmanager
+def pooled_connection(dbcfg: dict, reuse=True):
+    """Borrow an idle connection for these db settings (or open one), pooling it afterwards.
+    Connections that raised, or were borrowed with reuse=False (session state
+    may have changed), are closed rather than pooled."""
+    key = tuple(sorted((k, str(v)) for k, v in dbcfg.items()))
+    with _conn_pools_lock:
+        pool = _conn_pools.setdefault(key, queue.Queue(maxsize=CONN_POOL_SIZE))
+    conn = None
+    while conn is None:
+        try:
+            conn, idle_since = pool.get_nowait()
+        except queue.Empty:
+            conn = connect_from_cfg(dbcfg)
+            break
+        # Recently used connections are trusted; only long-idle ones cost a round trip
+        if time.monotonic() - idle_since > CONN_IDLE_CHECK_SECS and not _conn_alive(conn):
+            # Dropped by the server while idle
+            _close_quietly(conn)
+            conn = None
+    try:
+        yield conn
+    except BaseException:
+        _close_quietly(conn)
+        raise
+    try:
+        conn.rollback()
+        if not reuse:
+            raise queue.Full
+        with _conn_pools_lock:
+            # The pool is dropped by close_pooled_connections(); don't refill it
+            if _conn_pools.get(key) is not pool:
+                raise queue.Full
+            pool.put_nowait((conn, time.monotonic()))
+    except Exception:
+        _close_quietly(conn)
+
+
+def close_pooled_connections():
+    """Close every idle pooled connection (e.g. after the db settings change)"""
+    with _conn_pools_lock:
+        pools = list(_conn_pools.values())
+        _conn_pools.clear()
+    for pool in pools:
+        while True:
+            try:
+                conn, _ = pool.get_nowait()
+            except queue.Empty:
+                break
+            _close_quietly(conn)
+
+
+def test_connection(cfg_path: Path, conn=None):
+    """Attempt a DB connection using config and print basic server/user info.
+    An open connection may be passed in; it is left open for the caller."""
+    owns_conn = conn is None
+    if owns_conn:
+        cfg = load_cfg(cfg_path)
+        try:
+            conn = connect_from_cfg(cfg['db'])
+        except Exception as e:
+            print('Connection failed:', e)
+            return 1
     try:
         cur = conn.cursor()
-        # Fetch current login, server name and version
+        # Fetch current login, server name and version, plus a simple metadata query to
+        # ensure permissions, in one batch (one round trip; two result sets)
         # use safe alias names (avoid reserved keywords like current_user)
-        cur.execute("SELECT SUSER_SNAME() AS current_login, @@SERVERNAME AS server_name, @@VERSION AS version")
+        cur.execute("SELECT SUSER_SNAME() AS current_login, @@SERVERNAME AS server_name, @@VERSION AS version; "
+                    "SELECT COUNT(*) AS table_count FROM INFORMATION_SCHEMA.TABLES")
         row = cur.fetchone()
         if row:
+            login, server_name, version = row
             print('Connected successfully')
-            # access by alias names returned by the query
-            try:
-                print('Current user:', row.current_login)
-                print('Server name :', row.server_name)
-                print('Version     :', row.version.split('\n')[0])
-            except Exception:
-                # fallback to tuple-style indexing if attribute names differ
-                print('Current user:', row[0])
-                print('Server name :', row[1])
-                print('Version     :', str(row[2]).split('\n')[0])
+            print('Current user:', login)
+            print('Server name :', server_name)
+            print('Version     :', version.split('\n', 1)[0] if version else '')
         else:
             print('Connected but no info returned')
-        # Optionally try a simple metadata query to ensure permissions
+        # The metadata query's errors surface when its result set is reached
         try:
-            cur.execute("SELECT COUNT(*) AS table_count FROM INFORMATION_SCHEMA.TABLES")
-            rc = cur.fetchone()
-            if rc:
-                print('Information schema tables visible:', rc.table_count)
+            rc = cur.fetchone() if cur.nextset() else None
         except Exception as me:
             print('Warning: could not query INFORMATION_SCHEMA.TABLES:', me)
+            rc = None
+        if rc:
+            print('Information schema tables visible:', rc[0])
         return 0
     finally:
-        conn.close()
+        if owns_conn:
+            conn.close()
 
 
-def get_tables_list(cfg_path: Path):
-    """Get list of accessible base tables as list of (schema, table_name, full_name) tuples"""
-    cfg = json.load(open(cfg_path, 'r', encoding='utf-8'))
-    try:
-        conn = connect_from_cfg(cfg['db'])
-    except Exception as e:
-        return []
+def get_tables_list(cfg_path: Path, conn=None):
+    """Get list of accessible base tables as list of (schema, table_name, full_name) tuples.
+    An open connection may be passed in; it is left open for the caller."""
+    cfg = load_cfg(cfg_path)
+    owns_conn = conn is None
+    if owns_conn:
+        try:
+            conn = connect_from_cfg(cfg['db'])
+        except Exception as e:
+            return []
     try:
         cur = conn.cursor()
+        cur.arraysize = METADATA_FETCH_ROWS
         cur.execute("SELECT TABLE_SCHEMA, TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE='BASE TABLE' ORDER BY TABLE_SCHEMA, TABLE_NAME")
-        rows = cur.fetchall()
+        # Create full name: schema.table or [database].schema.table if database is specified
+        db = cfg.get('db', {}).get('database', '')
+        prefix = f"[{db}]." if db else ''
         tables = []
-        for r in rows:
-            try:
-                schema = r.TABLE_SCHEMA
-                table = r.TABLE_NAME
-            except Exception:
-                # fallback tuple
-                schema = r[0]
-                table = r[1]
-            # Create full name: schema.table or [database].schema.table if database is specified
-            db = cfg.get('db', {}).get('database', '')
-            if db:
-                full_name = f"[{db}].[{schema}].[{table}]"
-            else:
-                full_name = f"[{schema}].[{table}]"
-            tables.append((schema, table, full_name))
+        while True:
+            rows = cur.fetchmany()
+            if not rows:
+                break
+            for schema, table in rows:
+                tables.append((schema, table, f"{prefix}[{schema}].[{table}]"))
         return tables
     finally:
-        conn.close()
+        if owns_conn:
+            conn.close()
 
 
 def list_tables(cfg_path: Path):
@@ -246,11 +610,361 @@ def list_tables(cfg_path: Path):
     return 0
 
 
+def iter_sql_batches(sql_text: str):
+    """Yield the batches of a script one at a time, split on lines that contain
+    only GO (case-insensitive, optionally followed by ;)"""
+    # Split on \n only and rejoin with it, so batches keep the script's text byte
+    # for byte (CRLF endings, \x0b, \x0c or \u2028 inside string literals)
+    buf = []
+    for line in sql_text.split('\n'):
+        s = line.strip()
+        if s.endswith(';'):
+            s = s[:-1].rstrip()
+        if s.upper() == 'GO':
+            batch = '\n'.join(buf).strip()
+            if batch:
+                yield batch
+            buf.clear()
+        else:
+            buf.append(line)
+    batch = '\n'.join(buf).strip()
+    if batch:
+        yield batch
+
+
 def split_sql_batches(sql_text: str):
-    # Split on lines that contain only GO (case-insensitive)
-    batches = re.split(r'(?im)^\s*GO\s*;?\s*$', sql_text)
-    return [b.strip() for b in batches if b.strip()]
-def upload_excel_in_chunks(file_path, conn, table, table_cols, upload_mode='append', chunk_size=25000, log_callback=None):
+    return list(iter_sql_batches(sql_text))
+
+
+# SQL Server rejects statements with more than 2100 parameters, and a single
+# VALUES table constructor may hold at most 1000 rows.
+SQL_SERVER_MAX_PARAMS = 2100
+SQL_SERVER_MAX_VALUES_ROWS = 1000
+
+
+def insert_multi_values(cursor, table, cols, rows):
+    """
+    Insert rows as multi-row INSERT ... VALUES (...), (...) statements.
+
+    Used when parameter arrays (fast_executemany) are not available, e.g. with the
+    legacy "SQL Server" ODBC driver. Each statement carries as many rows as the
+    2100-parameter limit allows, so N rows cost ceil(N / rows_per_stmt) round trips.
+    """
+    ncols = len(cols)
+    rows_per_stmt = max(1, min(SQL_SERVER_MAX_VALUES_ROWS, (SQL_SERVER_MAX_PARAMS - 1) // ncols))
+    col_list = ", ".join(f"[{c}]" for c in cols)
+    row_placeholder = "(" + ", ".join("?" for _ in cols) + ")"
+    full_sql = None
+    for i in range(0, len(rows), rows_per_stmt):
+        chunk = rows[i:i + rows_per_stmt]
+        if len(chunk) == rows_per_stmt and full_sql is not None:
+            stmt = full_sql
+        else:
+            stmt = f"INSERT INTO {table} ({col_list}) VALUES " + ", ".join([row_placeholder] * len(chunk))
+            if len(chunk) == rows_per_stmt:
+                full_sql = stmt
+        cursor.execute(stmt, [val for row in chunk for val in row])
+
+
+def bulk_insert_rows(cursor, sql, table, cols, rows, method='fast'):
+    """
+    Insert a batch of row tuples.
+
+    method='fast' uses fast_executemany, which sends the batch as one parameter
+    array instead of one round trip per row. method='multi' uses multi-row VALUES
+    statements (see insert_multi_values). method='bulkcopy' streams the batch as a
+    TDS bulk load through an mssql-python cursor's bulkcopy() (mssql-python >= 1.4).
+    That opens its own connection and commits by itself, so it can't be part of
+    the cursor's transaction; upload_df_to_table only picks it when commit=True.
+    """
+    if method == 'multi':
+        insert_multi_values(cursor, table, cols, rows)
+        return
+    if method == 'bulkcopy':
+        # bulkcopy wants [schema].[table]; the database comes from the connection.
+        # keep_nulls: NULLs stay NULL, as with INSERT, instead of taking column defaults
+        _, schema, tbl = parse_table_name(table)
+        cursor.bulkcopy(f"[{schema}].[{tbl}]", rows, timeout=0,
+                        column_mappings=list(cols), keep_nulls=True)
+        return
+    cursor.fast_executemany = True
+    cursor.executemany(sql, rows)
+
+
+def bulk_insert_via_share(conn, df, table, share_dir):
+    """
+    Load a prepared DataFrame with a server-side BULK INSERT.
+
+    The frame is written as a tab-delimited UTF-8 file into share_dir, which must be
+    a path the SQL Server service account can read (typically a UNC share), and then
+    loaded by the server in one operation. Columns must already be in table order
+    (prepare_dataframe_for_table does this). Needs SQL Server 2017 or later (FORMAT='CSV').
+    Raises if the server cannot read the file so the caller can fall back to row
+    inserts. Returns the number of rows loaded.
+    """
+    # Only the columns that need a different text form are replaced; the rest are shared
+    staged_cols = {}
+    for col in df.columns:
+        dtype = df[col].dtype
+        if str(dtype) in ('bool', 'boolean'):
+            # BULK INSERT reads BIT columns as 1/0
+            staged_cols[col] = df[col].astype('Int8')
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            # Milliseconds, like the row path (DATETIME takes at most 3 fractional digits)
+            staged_cols[col] = df[col].dt.strftime('%Y-%m-%d %H:%M:%S.%f').str[:-3]
+        elif pd.api.types.is_float_dtype(dtype):
+            # Positional notation: to_csv writes 1e-05, which DECIMAL columns reject
+            staged_cols[col] = pd.Series(_bcp_text_column(df[col]), index=df.index, dtype=object)
+    if staged_cols:
+        staged = pd.DataFrame({col: staged_cols.get(col, df[col]) for col in df.columns},
+                              index=df.index, copy=False)
+    else:
+        staged = df
+
+    tmp = tempfile.NamedTemporaryFile(dir=share_dir, prefix='upload_', suffix='.tsv', delete=False)
+    tmp.close()
+    try:
+        staged.to_csv(tmp.name, index=False, sep='\t', encoding='utf-8',
+                      quoting=csv.QUOTE_MINIMAL)
+        # to_csv writes os.linesep line endings
+        row_terminator = '0x0d0a' if os.linesep == '\r\n' else '0x0a'
+        server_path = tmp.name.replace("'", "''")
+        cursor = conn.cursor()
+        cursor.execute(
+            f"BULK INSERT {table} FROM '{server_path}' "
+            f"WITH (FORMAT='CSV', FIRSTROW=2, FIELDTERMINATOR='\\t', ROWTERMINATOR='{row_terminator}', "
+            "CODEPAGE='65001', KEEPNULLS, TABLOCK)"
+        )
+        return len(staged)
+    finally:
+        try:
+            os.remove(tmp.name)
+        except OSError:
+            pass
+
+
+def transaction_open(conn):
+    """True if the connection's session still has an open transaction (@@TRANCOUNT > 0)"""
+    try:
+        return conn.cursor().execute("SELECT @@TRANCOUNT").fetchone()[0] > 0
+    except Exception:
+        return False
+
+
+# Rows per bcp batch (-b) and network packet size (-a) for bulk_insert_via_bcp
+BCP_BATCH_ROWS = 10000
+BCP_PACKET_SIZE = 32768
+
+
+def _bcp_text_column(series, sql_type=''):
+    """Text values (empty string for missing) of one column as bcp character mode reads
+    them. sql_type is the target column's lowercased type; datetimes are sent like the
+    row path sends them (see _datetime_column_values)."""
+    ptypes = pd.api.types
+    dtype = series.dtype
+    if ptypes.is_datetime64_any_dtype(dtype):
+        if getattr(dtype, 'tz', None) is not None:
+            raise ValueError(f"column {series.name} is timezone-aware")
+        if sql_type == 'date':
+            text = series.dt.strftime('%Y-%m-%d')
+        else:
+            # DATETIME takes at most 3 fractional digits
+            text = series.dt.strftime('%Y-%m-%d %H:%M:%S.%f').str[:-3]
+        if sql_type in ('datetime', 'datetime2', 'smalldatetime'):
+            # Out-of-range values go as NULL instead of failing the load
+            in_range = (series >= pd.Timestamp(SQL_DATETIME_MIN)) & (series <= pd.Timestamp(SQL_DATETIME_MAX))
+            return text.where(series.notna() & in_range, '').tolist()
+    elif ptypes.is_bool_dtype(dtype):
+        text = series.map({True: '1', False: '0'})
+    elif ptypes.is_float_dtype(dtype):
+        # Positional notation: DECIMAL columns reject '1e-05'
+        text = series.map(lambda v: np.format_float_positional(v, trim='-'), na_action='ignore')
+    else:
+        text = series.astype(object).where(series.notna(), None).map(str, na_action='ignore')
+    return text.where(series.notna(), '').tolist()
+
+
+def bulk_insert_via_bcp(df, table, dbcfg, table_cols=None, batch_size=BCP_BATCH_ROWS):
+    """
+    Load a prepared DataFrame with the bcp utility.
+
+    The frame is written to a local UTF-16 tab-delimited file and loaded with
+    `bcp ... in -w`, which bypasses the SQL parser and is minimally logged under the
+    simple/bulk-logged recovery models. bcp runs in its own session, so it cannot
+    see the caller's uncommitted work. Only Windows authentication is used: a SQL
+    login would have to pass its password on the bcp command line, where other
+    local users can read it. table_cols (from get_table_columns) gives the target
+    types for datetime columns.
+
+    Raises FileNotFoundError or ValueError before anything is sent (bcp not on
+    PATH, a SQL login, a text value with a tab or line break - bcp has no quoting)
+    so the caller can fall back to row inserts; raises RuntimeError if the load
+    fails. Returns the number of rows loaded.
+    """
+    if not dbcfg.get('trusted_connection', True):
+        raise ValueError('bcp is only used with trusted_connection (it would expose the password)')
+    bcp = shutil.which('bcp')
+    if bcp is None:
+        raise FileNotFoundError('bcp utility not found on PATH')
+    sql_types = {name: sql_type.lower() for name, sql_type, _ in (table_cols or [])}
+    columns = [_bcp_text_column(df[col], sql_types.get(col, '')) for col in df.columns]
+    for col, values in zip(df.columns, columns):
+        if any('\t' in v or '\n' in v or '\r' in v for v in values):
+            raise ValueError(f"column {col} has tabs or line breaks, which bcp character files can't hold")
+
+    db, schema, tbl = parse_table_name(table)
+    tmp = tempfile.NamedTemporaryFile(prefix='upload_', suffix='.tsv', delete=False)
+    tmp.close()
+    try:
+        # -w reads UTF-16LE without a BOM; its default row terminator is CR LF
+        with open(tmp.name, 'w', encoding='utf-16-le', newline='') as f:
+            f.writelines('\t'.join(row) + '\r\n' for row in zip(*columns))
+        cmd = [bcp, f"[{schema}].[{tbl}]", 'in', tmp.name, '-w', '-q',
+               '-S', dbcfg.get('server') or '', '-d', db or dbcfg.get('database') or '',
+               '-b', str(batch_size), '-a', str(BCP_PACKET_SIZE), '-k', '-h', 'TABLOCK', '-T']
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                universal_newlines=True)
+        if result.returncode != 0 or 'Error = [' in result.stdout:
+            raise RuntimeError(f"bcp exited with {result.returncode}: {result.stdout.strip()[-500:]}")
+        return len(df)
+    finally:
+        try:
+            os.remove(tmp.name)
+        except OSError:
+            pass
+
+
+def open_calamine_sheet(file_path):
+    """Return the first sheet of a workbook via python-calamine, or None if unavailable/unreadable"""
+    if python_calamine is None:
+        return None
+    try:
+        return python_calamine.CalamineWorkbook.from_path(str(file_path)).get_sheet_by_index(0)
+    except Exception as e:
+        print(f"calamine could not open {Path(file_path).name} ({e}); using openpyxl")
+        return None
+
+
+def iter_calamine_rows(sheet):
+    """Yield the rows of a calamine sheet as tuples, with empty cells as None"""
+    rows = sheet.iter_rows() if hasattr(sheet, 'iter_rows') else sheet.to_python()
+    for row in rows:
+        yield tuple(None if v == '' else v for v in row)
+
+
+def iter_excel_chunks(file_path, chunk_size=25000, headers=None):
+    """
+    Yield DataFrames of up to chunk_size rows from the first sheet of an Excel file.
+    Rows are parsed once, by python-calamine when installed (also reads .xls) or by
+    openpyxl read_only mode otherwise. Completely empty rows are skipped.
+    """
+    wb = None
+    sheet = open_calamine_sheet(file_path)
+    if sheet is None and Xlsx2csv is not None and Path(file_path).suffix.lower() in ('.xlsx', '.xlsm'):
+        yield from iter_xlsx_chunks_via_csv(file_path, chunk_size, headers)
+        return
+    if sheet is not None:
+        rows = iter_calamine_rows(sheet)
+    else:
+        from openpyxl import load_workbook
+        wb = load_workbook(filename=file_path, read_only=True, data_only=True)
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+    try:
+        header_row = next(rows, None)
+        if header_row is None:
+            return
+        if headers is None:
+            headers = [v if v is not None else f"Column{i + 1}" for i, v in enumerate(header_row)]
+        width = len(headers)
+        batch = []
+        for row in rows:
+            if len(row) != width:
+                row = tuple(row[:width]) + (None,) * (width - len(row))
+            if all(v is None for v in row):
+                continue
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame.from_records(batch, columns=headers)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=headers)
+    finally:
+        if wb is not None:
+            wb.close()
+
+
+def read_xlsx_streaming(file_path, usecols=None):
+    """
+    Read the first sheet of an .xlsx file in openpyxl read_only mode, keeping only
+    the usecols columns (header names) of each row as it streams past, so cells of
+    unused columns are dropped immediately. Completely empty rows are skipped.
+    """
+    from openpyxl import load_workbook
+    wb = load_workbook(filename=file_path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header_row = next(rows, None)
+        if header_row is None:
+            return pd.DataFrame()
+        headers = [v if v is not None else f"Column{i + 1}" for i, v in enumerate(header_row)]
+        if usecols is not None:
+            positions = [headers.index(c) for c in usecols]
+            headers = list(usecols)
+        else:
+            positions = list(range(len(headers)))
+        width = max(positions) + 1 if positions else 0
+        pick = operator.itemgetter(*positions) if len(positions) > 1 else None
+        records = []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            records.append(pick(row) if pick else tuple(row[i] for i in positions))
+        return pd.DataFrame.from_records(records, columns=headers)
+    finally:
+        wb.close()
+
+
+def iter_xlsx_chunks_via_csv(file_path, chunk_size=25000, headers=None):
+    """
+    Convert the first sheet to a temporary CSV with xlsx2csv (a streaming XML
+    parse), then read it back in chunks with pandas' C CSV parser.
+
+    Every column is read as text: letting pandas guess types would drop leading
+    zeros from IDs like "00123" and could give a column a different dtype in each
+    chunk. prepare_dataframe_for_table converts to the table's types afterwards.
+    """
+    fd, csv_path = tempfile.mkstemp(suffix='.csv')
+    os.close(fd)
+    try:
+        # Dates as pandas would print them, so to_datetime and text columns see one format
+        Xlsx2csv(str(file_path), outputencoding='utf-8', skip_empty_lines=True,
+                 dateformat='%Y-%m-%d %H:%M:%S').convert(csv_path, sheetid=1)
+        for df_chunk in pd.read_csv(csv_path, chunksize=chunk_size, encoding='utf-8', dtype=str):
+            if headers is not None and len(df_chunk.columns) == len(headers):
+                df_chunk.columns = headers
+            yield df_chunk
+    finally:
+        try:
+            os.remove(csv_path)
+        except OSError:
+            pass
+
+
+def iter_file_chunks(file_path, chunk_size=25000, headers=None):
+    """Yield DataFrames of up to chunk_size rows from an Excel or CSV file"""
+    if Path(file_path).suffix.lower() == '.csv':
+        for df_chunk in pd.read_csv(file_path, chunksize=chunk_size):
+            if headers is not None and len(df_chunk.columns) == len(headers):
+                df_chunk.columns = headers
+            yield df_chunk
+    else:
+        yield from iter_excel_chunks(file_path, chunk_size, headers)
+
+
+def upload_excel_in_chunks(file_path, conn, table, table_cols, upload_mode='append', chunk_size=25000, log_callback=None,
+                           batch_size=5000, method='fast', bulk_insert_dir=None, commit_rows=None, bcp_dbcfg=None):
     """
     Read and upload Excel or CSV file in chunks to avoid loading entire file into memory.
     This is much more memory-efficient for large files.
@@ -263,6 +977,11 @@ def upload_excel_in_chunks(file_path, conn, table, table_cols, upload_mode='appe
         upload_mode: 'append' or 'delete'
         chunk_size: Number of rows to process at a time
         log_callback: Optional function to call with log messages
+        batch_size: Rows sent per insert batch (passed to upload_df_to_table)
+        method: 'fast' (fast_executemany), 'multi' (multi-row VALUES) or 'bulkcopy' (mssql-python)
+        bulk_insert_dir: Optional server-readable directory for BULK INSERT staging
+        commit_rows: Rows between commits inside a chunk (passed to upload_df_to_table)
+        bcp_dbcfg: db settings to load each chunk with the bcp utility (passed to upload_df_to_table)
     
     Returns:
         Total number of rows uploaded
@@ -273,7 +992,6 @@ def upload_excel_in_chunks(file_path, conn, table, table_cols, upload_mode='appe
         else:
             print(msg, flush=True)
     
-    import time
     file_ext = Path(file_path).suffix.lower()
     
     # First, get total row count and column names
@@ -287,6 +1005,15 @@ def upload_excel_in_chunks(file_path, conn, table, table_cols, upload_mode='appe
         # Count total rows (this is fast for CSV)
         with open(file_path, 'r', encoding='utf-8-sig') as f:
             total_rows = sum(1 for line in f) - 1  # Subtract header row
+    elif file_ext == '.xls' and python_calamine is not None:
+        # openpyxl can't open legacy .xls; calamine can (the openpyxl path below
+        # stays for .xlsx because it reads the header without parsing the sheet)
+        sheet = open_calamine_sheet(file_path)
+        if sheet is None:
+            raise ValueError(f"Could not read {Path(file_path).name}")
+        first = next(iter_calamine_rows(sheet), ())
+        headers = [v if v is not None else f"Column{i + 1}" for i, v in enumerate(first)]
+        total_rows = max(sheet.height - 1, 0)
     else:
         # Excel file - use openpyxl for efficient reading
         from openpyxl import load_workbook
@@ -305,98 +1032,105 @@ def upload_excel_in_chunks(file_path, conn, table, table_cols, upload_mode='appe
     
     # Handle upload mode
     log(f"  Upload mode: {upload_mode}")
-    cursor = conn.cursor()
-    if upload_mode == 'delete':
-        try:
-            log(f"  Deleting existing data from table (upload_mode='delete')...")
-            cursor.execute(f"DELETE FROM {table}")
-            conn.commit()  # Commit the delete before starting inserts
-            log(f"  ✓ Cleared existing data from table")
-        except Exception as e:
-            log(f"  ✗ Warning: Could not delete table data: {e}")
-            conn.rollback()
+    # 'delete' clears the table together with the first chunk (in upload_df_to_table),
+    # so a file that fails before its first rows land leaves the table as it was
+    clear_pending = upload_mode == 'delete'
+    if clear_pending:
+        log(f"  Existing data will be deleted along with the first chunk (upload_mode='delete')")
     else:
         log(f"  Appending to existing data (upload_mode='append')")
     
-    # Read and process in chunks
+    # Read and process in chunks. A reader thread parses the next chunk while this
+    # thread prepares and uploads the current one; the queue holds at most 2 chunks
+    # so memory stays O(chunk_size) however large the file is.
     total_uploaded = 0
     chunk_num = 0
-    start_row = 2  # Start at row 2 (skip header row 1)
     
     log(f"  Starting chunked processing (reading {chunk_size:,} rows at a time)...")
     
-    while start_row <= total_rows + 1:  # +1 because max_row includes header
-        chunk_num += 1
+    chunks = queue.Queue(maxsize=2)
+    stop = threading.Event()
+    done = object()
+    
+    def offer(item):
+        # Block while the queue is full, but give up once the uploader has stopped
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def reader():
+        source = iter_file_chunks(file_path, chunk_size, headers)
         try:
-            # Calculate how many rows to read in this chunk
-            rows_to_read = min(chunk_size, total_rows + 2 - start_row)
-            
-            if rows_to_read <= 0:
-                break  # No more data
-            
-            # Read chunk using skiprows and nrows
+            for df_chunk in source:
+                if not offer(df_chunk):
+                    return
+            offer(done)
+        except BaseException as e:
+            offer(e)
+        finally:
+            source.close()  # releases the workbook if we stopped early
+    
+    reader_thread = threading.Thread(target=reader, daemon=True)
+    reader_thread.start()
+    try:
+        while True:
             chunk_start = time.time()
-            log(f"  Reading chunk {chunk_num} (rows {start_row}-{start_row + rows_to_read - 1})...")
-            
-            # Read chunk based on file type
-            skip_list = list(range(0, start_row - 1))  # Skip header (0) and rows before start_row
-            
-            if file_ext == '.csv':
-                # For CSV, use skiprows and nrows
-                df_chunk = pd.read_csv(
-                    file_path,
-                    skiprows=skip_list,
-                    nrows=rows_to_read
-                )
-            else:
-                # Excel file
-                df_chunk = pd.read_excel(
-                    file_path, 
-                    engine='openpyxl',
-                    skiprows=skip_list,  # List of row indices to skip (0-indexed)
-                    nrows=rows_to_read
-                )
-            
-            if df_chunk.empty:
-                break  # No more data
-            
-            # Set column names from headers we extracted
-            if len(df_chunk.columns) == len(headers):
-                df_chunk.columns = headers
-            elif len(df_chunk.columns) > 0:
-                # If column count doesn't match, use what we have
-                log(f"  Warning: Column count mismatch (expected {len(headers)}, got {len(df_chunk.columns)})")
-            
-            # Prepare this chunk
-            from upload_refresh import prepare_dataframe_for_table
-            df_prepared = prepare_dataframe_for_table(df_chunk, table_cols, filename=Path(file_path).name)
-            
-            # Upload this chunk using regular method
-            # For chunks after the first, always append (table was already cleared at start if needed)
-            chunk_upload_mode = 'append' if chunk_num > 1 else upload_mode
-            upload_df_to_table(conn, df_prepared, table, upload_mode=chunk_upload_mode, table_cols=table_cols)
-            
-            # CRITICAL: Commit after each chunk to avoid huge transaction log and performance degradation
-            conn.commit()
-            
-            total_uploaded += len(df_prepared)
-            chunk_time = time.time() - chunk_start
-            progress_pct = (total_uploaded / total_rows) * 100 if total_rows > 0 else 0
-            
-            log(f"  ✓ Chunk {chunk_num}: {len(df_prepared):,} rows uploaded ({total_uploaded:,}/{total_rows:,}, {progress_pct:.1f}%) in {chunk_time:.1f}s")
-            
-            # Move to next chunk
-            start_row += rows_to_read
-            
-            # Free memory explicitly
-            del df_chunk
-            del df_prepared
-            import gc
-            gc.collect()  # Force garbage collection to free memory
-            
+            df_chunk = chunks.get()
+            if df_chunk is done:
+                break
+            if isinstance(df_chunk, BaseException):
+                raise df_chunk
+            chunk_num += 1
+            try:
+                if df_chunk.empty:
+                    continue
+                log(f"  Uploading chunk {chunk_num} ({len(df_chunk):,} rows)...")
+                
+                # Prepare this chunk
+                df_prepared = prepare_dataframe_for_table(df_chunk, table_cols, filename=Path(file_path).name)
+                
+                # The first chunk clears the table if asked; later chunks append
+                chunk_mode = 'delete' if clear_pending else 'append'
+                clear_pending = False
+                upload_df_to_table(conn, df_prepared, table, upload_mode=chunk_mode, table_cols=table_cols,
+                                   batch_size=batch_size, method=method, bulk_insert_dir=bulk_insert_dir,
+                                   commit_rows=commit_rows, bcp_dbcfg=bcp_dbcfg)
+                
+                # CRITICAL: Commit after each chunk to avoid huge transaction log and performance degradation
+                conn.commit()
+                
+                total_uploaded += len(df_prepared)
+                chunk_time = time.time() - chunk_start
+                progress_pct = (total_uploaded / total_rows) * 100 if total_rows > 0 else 0
+                
+                log(f"  ✓ Chunk {chunk_num}: {len(df_prepared):,} rows uploaded ({total_uploaded:,}/{total_rows:,}, {progress_pct:.1f}%) in {chunk_time:.1f}s")
+                
+                del df_chunk
+                del df_prepared
+            except Exception as e:
+                log(f"  ✗ Error processing chunk {chunk_num}: {e}")
+                # Discard this chunk's uncommitted rows (and a DELETE not yet committed)
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                raise
+    finally:
+        stop.set()
+        reader_thread.join(timeout=5)
+    
+    if clear_pending:
+        # The file had no rows: still clear the table, as 'delete' promises
+        try:
+            conn.cursor().execute(f"DELETE FROM {table}")
+            log(f"  ✓ Cleared existing data from table")
         except Exception as e:
-            log(f"  ✗ Error processing chunk {chunk_num}: {e}")
-            raise
+            log(f"  ✗ Warning: Could not delete table data: {e}")
+            conn.rollback()
     
     # Final commit (though we already commit after each chunk)
     try:
@@ -407,13 +1141,25 @@ def upload_excel_in_chunks(file_path, conn, table, table_cols, upload_mode='appe
     return total_uploaded
 
 
-def upload_df_to_table(conn, df, table, upload_mode='append', table_cols=None):
+def upload_df_to_table(conn, df, table, upload_mode='append', table_cols=None, batch_size=5000, method='fast',
+                       bulk_insert_dir=None, commit_rows=None, commit=True, bcp_dbcfg=None):
     """
     Upload DataFrame to SQL Server table.
     
     upload_mode options:
     - 'append': Add data without clearing existing data
     - 'delete': Delete all existing data, then insert new data (uses DELETE instead of TRUNCATE)
+
+    batch_size is the number of rows sent per batch; a commit happens every
+    commit_rows rows (default: after every batch) and at the end. method selects
+    the insert path: 'fast' (fast_executemany), 'multi' (multi-row VALUES) or
+    'bulkcopy' (mssql-python's bulk copy, used only for appends with commit=True).
+    If bulk_insert_dir is set, the rows are first staged there and loaded with
+    BULK INSERT; row inserts are only used if the server cannot read that path.
+    If bcp_dbcfg is set, appends with commit=True are loaded with the bcp utility
+    using those connection settings (see bulk_insert_via_bcp); loads that clear the
+    table or run in the caller's transaction use row inserts, so they stay atomic.
+    With commit=False nothing is committed and the caller owns the transaction.
     """
     cursor = conn.cursor()
     cols = list(df.columns)
@@ -422,6 +1168,7 @@ def upload_df_to_table(conn, df, table, upload_mode='append', table_cols=None):
         return
     
     # Handle table clearing based on upload_mode
+    cleared = upload_mode in ('delete', 'truncate')
     if upload_mode == 'delete':
         try:
             # DELETE is slower but works with foreign keys (can be rolled back)
@@ -438,6 +1185,34 @@ def upload_df_to_table(conn, df, table, upload_mode='append', table_cols=None):
             cursor.execute(f"DELETE FROM {table}")
     # 'append' mode does not clear the table
     
+    if bulk_insert_dir:
+        try:
+            loaded = bulk_insert_via_share(conn, df, table, bulk_insert_dir)
+            if commit:
+                conn.commit()
+            print(f"✓ BULK INSERT loaded {loaded:,} rows", flush=True)
+            return
+        except Exception as e:
+            # Some BULK INSERT errors abort the transaction; row inserts on top of a
+            # rolled-back DELETE (or caller's work) would duplicate or lose rows
+            if (cleared or not commit) and not transaction_open(conn):
+                raise RuntimeError(f"BULK INSERT from {bulk_insert_dir} failed and rolled back the "
+                                   f"transaction: {e}") from e
+            print(f"BULK INSERT from {bulk_insert_dir} failed, falling back to row inserts: {e}", flush=True)
+    
+    if bcp_dbcfg and (cleared or not commit):
+        # bcp connects separately and commits its own batches; the rows go in this
+        # session instead, so they roll back together with the DELETE (or the caller's work)
+        print("bcp can't join the open transaction, using row inserts", flush=True)
+    elif bcp_dbcfg:
+        try:
+            loaded = bulk_insert_via_bcp(df, table, bcp_dbcfg, table_cols)
+            print(f"✓ bcp loaded {loaded:,} rows", flush=True)
+            return
+        except (FileNotFoundError, ValueError) as e:
+            # Nothing was sent; a failed load may have committed batches, so it raises
+            print(f"bcp not usable, falling back to row inserts: {e}", flush=True)
+    
     placeholders = ", ".join("?" for _ in cols)
     col_list = ", ".join(f"[{c}]" for c in cols)
     sql = f"INSERT INTO {table} ({col_list}) VALUES ({placeholders})"
@@ -451,7 +1226,7 @@ def upload_df_to_table(conn, df, table, upload_mode='append', table_cols=None):
                 col_max_lengths[col_name] = max_length
             elif 'VARCHAR' in sql_type.upper() or 'NVARCHAR' in sql_type.upper():
                 # Try to extract from type string if max_length not provided
-                match = re.search(r'\((\d+)\)', sql_type)
+                match = _TYPE_LENGTH_RE.search(sql_type)
                 if match:
                     col_max_lengths[col_name] = int(match.group(1))
     
@@ -462,8 +1237,8 @@ def upload_df_to_table(conn, df, table, upload_mode='append', table_cols=None):
     # Cache date range constants to avoid recreating on every row
     min_date = date_type(1, 1, 1)  # SQL Server DATE minimum
     max_date = date_type(9999, 12, 31)  # SQL Server DATE maximum
-    min_datetime = pd.Timestamp('1753-01-01')  # SQL Server DATETIME minimum
-    max_datetime = pd.Timestamp('9999-12-31 23:59:59')  # SQL Server DATETIME maximum
+    min_datetime = pd.Timestamp(SQL_DATETIME_MIN)  # SQL Server DATETIME minimum
+    max_datetime = pd.Timestamp(SQL_DATETIME_MAX)  # SQL Server DATETIME maximum
     if table_cols:
         for col_name, sql_type, _ in table_cols:
             sql_type_lower = sql_type.lower()
@@ -473,168 +1248,168 @@ def upload_df_to_table(conn, df, table, upload_mode='append', table_cols=None):
             # Check if it's DATETIME/DATETIME2/SMALLDATETIME - these keep time component
             col_is_datetime[col_name] = (sql_type_lower in ('datetime', 'datetime2', 'smalldatetime'))
     
-    # OPTIMIZATION: Pre-process DATE and DATETIME columns using vectorized operations
-    # This is MUCH faster than row-by-row conversion (10-100x speedup)
-    df_processed = df.copy()
+    # Frames whose columns all convert directly skip the per-value conversion below entirely
+    data = columnar_rows(df, col_data_types, col_max_lengths)
+    if data is not None:
+        print(f"Prepared {len(df):,} rows for upload column-wise ✓", flush=True)
+    else:
+        # OPTIMIZATION: Pre-process DATE and DATETIME columns using vectorized operations
+        # This is MUCH faster than row-by-row conversion (10-100x speedup)
+        df_processed = df.copy()
     
-    # Process DATE columns in bulk (vectorized) - convert to date objects
-    for col_name in df_processed.columns:
-        if col_name in col_is_date_only and col_is_date_only[col_name]:
-            try:
-                # Convert to datetime first (handles strings, timestamps, etc.)
-                dt_series = pd.to_datetime(df_processed[col_name], errors='coerce')
-                # Extract date part (returns date objects)
-                date_series = dt_series.dt.date
-                # Note: Invalid dates (NaT) will be handled in row-by-row processing
-                df_processed[col_name] = date_series
-            except Exception:
-                # Fallback: leave as-is, will be handled row-by-row
-                pass
+        # Process DATE columns in bulk (vectorized) - convert to date objects
+        for col_name in df_processed.columns:
+            if col_name in col_is_date_only and col_is_date_only[col_name]:
+                try:
+                    # Convert to datetime first (handles strings, timestamps, etc.)
+                    dt_series = pd.to_datetime(df_processed[col_name], errors='coerce')
+                    # Extract date part (returns date objects)
+                    date_series = dt_series.dt.date
+                    # Note: Invalid dates (NaT) will be handled in row-by-row processing
+                    df_processed[col_name] = date_series
+                except Exception:
+                    # Fallback: leave as-is, will be handled row-by-row
+                    pass
     
-    # Process DATETIME columns in bulk (vectorized) - keep as Timestamp, convert to Python datetime row-by-row
-    for col_name in df_processed.columns:
-        if col_name in col_is_datetime and col_is_datetime[col_name]:
-            try:
-                # Convert to datetime (handles strings, etc.)
-                dt_series = pd.to_datetime(df_processed[col_name], errors='coerce')
-                # Replace out-of-range datetimes with NaT
-                mask = (dt_series < min_datetime) | (dt_series > max_datetime)
-                dt_series.loc[mask] = pd.NaT
-                df_processed[col_name] = dt_series
-            except Exception:
-                # Fallback: leave as-is, will be handled row-by-row
-                pass
+        # Process DATETIME columns in bulk (vectorized) - keep as Timestamp, convert to Python datetime row-by-row
+        for col_name in df_processed.columns:
+            if col_name in col_is_datetime and col_is_datetime[col_name]:
+                try:
+                    # Convert to datetime (handles strings, etc.)
+                    dt_series = pd.to_datetime(df_processed[col_name], errors='coerce')
+                    # Replace out-of-range datetimes with NaT
+                    mask = (dt_series < min_datetime) | (dt_series > max_datetime)
+                    dt_series.loc[mask] = pd.NaT
+                    df_processed[col_name] = dt_series
+                except Exception:
+                    # Fallback: leave as-is, will be handled row-by-row
+                    pass
     
-    # Convert DataFrame to list of tuples, converting pandas NA/NaN to None for SQL Server
-    # Use itertuples() instead of iterrows() to better preserve data types, especially booleans
-    # This is more memory efficient and faster than iterrows()
-    total_rows = len(df_processed)
-    if total_rows > 50000:
-        print(f"Converting {total_rows:,} rows to upload format...", end=' ', flush=True)
-    data = []
-    rows_processed = 0
-    for row_tuple in df_processed.itertuples(index=False):
-        row_data = []
-        for i, val in enumerate(row_tuple):
-            col_name = cols[i]
-            # Special handling for BIT columns - ensure True/False are preserved
-            if col_name in col_data_types and 'bit' in col_data_types[col_name]:
-                # Handle pandas NA/NaN first
-                if pd.isna(val):
-                    row_data.append(None)
-                else:
-                    # Convert numpy types to Python native types first
-                    val = convert_numpy_to_python(val)
-                    
-                    # Force conversion to Python bool to preserve True/False
-                    # iterrows/itertuples might convert to int, so explicitly convert back
-                    if isinstance(val, bool):
-                        # Already a bool - keep as is
-                        row_data.append(val)
-                    elif isinstance(val, (int, float)) and val in (0, 1):
-                        # Convert 1/0 back to True/False
-                        row_data.append(True if val == 1 else False)
-                    else:
-                        # Try to convert to bool
-                        try:
-                            # Use explicit bool() conversion to ensure True/False
-                            bool_val = bool(val)
-                            row_data.append(bool_val)
-                        except:
+        # Convert rows to tuples lazily, converting pandas NA/NaN to None for SQL Server.
+        # Only one batch of converted rows exists at a time, so memory stays bounded
+        # by batch_size instead of growing with the file.
+        # Use itertuples() instead of iterrows() to better preserve data types, especially booleans
+        def convert_rows():
+            for row_tuple in df_processed.itertuples(index=False):
+                row_data = []
+                for i, val in enumerate(row_tuple):
+                    col_name = cols[i]
+                    # Special handling for BIT columns - ensure True/False are preserved
+                    if col_name in col_data_types and 'bit' in col_data_types[col_name]:
+                        # Handle pandas NA/NaN first
+                        if pd.isna(val):
                             row_data.append(None)
-            else:
-                # Handle pandas NA (from nullable dtypes like Int64, boolean, string)
-                if pd.isna(val):
-                    row_data.append(None)
-                else:
-                    # Convert numpy types to Python native types for pyodbc compatibility
-                    val = convert_numpy_to_python(val)
-                    
-                    # DATE and DATETIME columns are already pre-processed above using vectorized operations
-                    # Just need to handle edge cases and convert Timestamp to Python datetime for DATETIME
-                    if col_name in col_is_datetime and col_is_datetime[col_name]:
-                        # DATETIME columns: convert Timestamp to Python datetime
-                        if isinstance(val, pd.Timestamp):
-                            if pd.isna(val):
-                                val = None
+                        else:
+                            # Convert numpy types to Python native types first
+                            val = convert_numpy_to_python(val)
+                        
+                            # Force conversion to Python bool to preserve True/False
+                            # iterrows/itertuples might convert to int, so explicitly convert back
+                            if isinstance(val, bool):
+                                # Already a bool - keep as is
+                                row_data.append(val)
+                            elif isinstance(val, (int, float)) and val in (0, 1):
+                                # Convert 1/0 back to True/False
+                                row_data.append(True if val == 1 else False)
                             else:
+                                # Try to convert to bool
                                 try:
-                                    val = val.to_pydatetime()
-                                except (ValueError, OverflowError, AttributeError):
-                                    val = None
-                    
-                    # Truncate string values if they exceed column max length
-                    if isinstance(val, str) and col_name in col_max_lengths:
-                        max_len = col_max_lengths[col_name]
-                        if len(val) > max_len:
-                            val = val[:max_len]
-                            print(f"Warning: Truncated '{col_name}' value (length {len(val)} > {max_len})")
-                    row_data.append(val)
-        data.append(tuple(row_data))
-        rows_processed += 1
-        # Show progress for very large files
-        if total_rows > 50000 and rows_processed % 10000 == 0:
-            progress_pct = (rows_processed / total_rows) * 100
-            print(f"\rConverting {total_rows:,} rows to upload format... {rows_processed:,}/{total_rows:,} ({progress_pct:.1f}%)", end='', flush=True)
-    
-    if total_rows > 50000:
-        print()  # New line after progress updates
-    else:
-        print("✓", flush=True)
-    
-    # Final check: Ensure BIT columns are True/False, not 1/0
-    # This is a safety check in case any values slipped through as integers
-    if table_cols:
-        for col_name, sql_type, _ in table_cols:
-            if 'bit' in sql_type.lower() and col_name in cols:
-                col_idx = cols.index(col_name)
-                # Rebuild data list with corrected boolean values
-                corrected_data = []
-                for row_data in data:
-                    if col_idx < len(row_data):
-                        val = row_data[col_idx]
-                        if isinstance(val, (int, float)) and val in (0, 1):
-                            # Convert 1/0 to True/False
-                            row_data_list = list(row_data)
-                            row_data_list[col_idx] = True if val == 1 else False
-                            corrected_data.append(tuple(row_data_list))
-                        else:
-                            corrected_data.append(row_data)
+                                    # Use explicit bool() conversion to ensure True/False
+                                    bool_val = bool(val)
+                                    row_data.append(bool_val)
+                                except:
+                                    row_data.append(None)
                     else:
-                        corrected_data.append(row_data)
-                data = corrected_data
-                break  # Only need to check once per column
+                        # Handle pandas NA (from nullable dtypes like Int64, boolean, string)
+                        if pd.isna(val):
+                            row_data.append(None)
+                        else:
+                            # Convert numpy types to Python native types for pyodbc compatibility
+                            val = convert_numpy_to_python(val)
+                        
+                            # DATE and DATETIME columns are already pre-processed above using vectorized operations
+                            # Just need to handle edge cases and convert Timestamp to Python datetime for DATETIME
+                            if col_name in col_is_datetime and col_is_datetime[col_name]:
+                                # DATETIME columns: convert Timestamp to Python datetime
+                                if isinstance(val, pd.Timestamp):
+                                    if pd.isna(val):
+                                        val = None
+                                    else:
+                                        try:
+                                            val = val.to_pydatetime()
+                                        except (ValueError, OverflowError, AttributeError):
+                                            val = None
+                        
+                            # Truncate string values if they exceed column max length
+                            if isinstance(val, str) and col_name in col_max_lengths:
+                                max_len = col_max_lengths[col_name]
+                                if len(val) > max_len:
+                                    val = val[:max_len]
+                                    print(f"Warning: Truncated '{col_name}' value (length {len(val)} > {max_len})")
+                            row_data.append(val)
+                yield tuple(row_data)
     
-    cursor.fast_executemany = True
+        data = convert_rows()
+    
+    if method == 'bulkcopy':
+        # mssql-python's bulk copy loads over its own connection and commits by itself,
+        # so it can't be part of this session's transaction: a pending DELETE (or the
+        # caller's open transaction) keeps the rows here, where they roll back together
+        if not hasattr(cursor, 'bulkcopy'):
+            print('Connection has no bulk copy ("client": "mssql-python"), using executemany', flush=True)
+            method = 'fast'
+        elif cleared or not commit:
+            print("Bulk copy can't join the open transaction, using executemany", flush=True)
+            method = 'fast'
     
     # Process in batches to avoid memory errors with large datasets
-    # Reduced batch size for better performance and more frequent commits
-    batch_size = 5000  # Reduced from 10,000 for better performance
-    total_rows = len(data)
+    batch_size = max(1, int(batch_size))
+    total_rows = len(df)
+    rows = iter(data)
+    # First rows sent, for the error report below
+    sample_rows = []
     
     try:
         if total_rows > batch_size:
             print(f"Large dataset detected ({total_rows:,} rows). Processing in batches of {batch_size:,}...", flush=True)
             rows_uploaded = 0
+            uncommitted = 0
+            commit_every = max(batch_size, int(commit_rows)) if commit_rows else batch_size
             total_batches = (total_rows + batch_size - 1) // batch_size
             for i in range(0, total_rows, batch_size):
-                batch = data[i:i + batch_size]
+                batch = list(itertools.islice(rows, batch_size))
+                if not sample_rows:
+                    sample_rows = batch[:3]
                 batch_num = (i // batch_size) + 1
                 print(f"  Uploading batch {batch_num}/{total_batches} ({len(batch):,} rows)...", end=' ', flush=True)
-                cursor.executemany(sql, batch)
-                # CRITICAL: Commit after each batch to avoid transaction log growth
-                conn.commit()
+                bulk_insert_rows(cursor, sql, table, cols, batch, method=method)
                 rows_uploaded += len(batch)
+                uncommitted += len(batch)
+                # Commit periodically to keep the transaction log in check, but not
+                # necessarily every batch (each commit is a log flush on the server)
+                if commit and uncommitted >= commit_every:
+                    conn.commit()
+                    uncommitted = 0
                 progress_pct = (rows_uploaded / total_rows) * 100
                 print(f"✓ ({rows_uploaded:,}/{total_rows:,} rows, {progress_pct:.1f}%)", flush=True)
+            if commit:
+                conn.commit()
             print(f"✓ All {total_rows:,} rows uploaded successfully!", flush=True)
         else:
             # Small dataset - upload all at once
             print(f"Uploading {total_rows:,} rows...", end=' ', flush=True)
-            cursor.executemany(sql, data)
-            conn.commit()
+            batch = list(rows)
+            sample_rows = batch[:3]
+            bulk_insert_rows(cursor, sql, table, cols, batch, method=method)
+            if commit:
+                conn.commit()
             print(f"✓ Complete!", flush=True)
     except Exception as e:
+        # Discard the uncommitted part of the load
+        try:
+            conn.rollback()
+        except Exception:
+            pass
         # Extract detailed error information from pyodbc errors
         error_details = {}
         error_msg = str(e)
@@ -690,7 +1465,7 @@ def upload_df_to_table(conn, df, table, upload_mode='append', table_cols=None):
         print(f"UPLOAD ERROR - Detailed Information")
         print(f"{'='*80}")
         print(f"\nTable: {table}")
-        print(f"Total rows attempted: {len(data)}")
+        print(f"Total rows attempted: {total_rows}")
         
         # Show error details
         print(f"\n--- Error Information ---")
@@ -768,7 +1543,7 @@ def upload_df_to_table(conn, df, table, upload_mode='append', table_cols=None):
         
         # Show sample data with better formatting
         print(f"\n--- Sample Data (First 3 Rows) ---")
-        for i, row in enumerate(data[:3]):
+        for i, row in enumerate(sample_rows):
             print(f"\n  Row {i+1}:")
             for j, val in enumerate(row):
                 col_name = cols[j] if j < len(cols) else f"Column{j}"
@@ -863,15 +1638,29 @@ def find_files(folder: str, patterns, base: Path = None):
     if base is None:
         base = Path(__file__).parent.resolve()
     p = resolve_folder_path(folder, base)
+    # One directory read for all plain name patterns (e.g. "*.xlsx", "*.csv");
+    # patterns that reach into subfolders still go through glob
+    names = None
     files = []
+    seen = set()
     for pat in patterns:
-        files.extend(sorted(p.glob(pat)))
+        if '/' in pat or '\\' in pat or '**' in pat:
+            matches = sorted(p.glob(pat))
+        else:
+            if names is None:
+                with os.scandir(p) as it:
+                    names = [e.name for e in it if e.is_file()]
+            matches = [p / name for name in sorted(fnmatch.filter(names, pat))]
+        for f in matches:
+            if f not in seen:
+                seen.add(f)
+                files.append(f)
     return files
 
 
 def ensure_folders_from_config(cfg_path: Path, base: Path):
     """Create inbound folders referenced in config.json. If folder is relative, create under base/inbound."""
-    cfg = json.load(open(cfg_path, 'r', encoding='utf-8'))
+    cfg = load_cfg(cfg_path)
     for entry in cfg.get('folders', []):
         folder = entry.get('folder')
         if not folder:
@@ -882,9 +1671,11 @@ def ensure_folders_from_config(cfg_path: Path, base: Path):
         p.mkdir(parents=True, exist_ok=True)
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_table_name(full_name: str):
     # Accept formats: [db].[schema].[table] or schema.table or table
-    parts = [p.strip().strip('[]') for p in re.split(r'\.', full_name) if p.strip()]
+    # (cached: the same few names are parsed for every file, cache key and query)
+    parts = [p.strip().strip('[]') for p in full_name.split('.') if p.strip()]
     if len(parts) == 3:
         return parts[0], parts[1], parts[2]
     if len(parts) == 2:
@@ -894,7 +1685,82 @@ def parse_table_name(full_name: str):
     raise ValueError(f'Unable to parse table name: {full_name}')
 
 
+# get_table_columns results: {(server, database, schema, table): (fetched_at, cols)}
+# Entries expire after COLUMN_CACHE_TTL seconds; at most COLUMN_CACHE_MAX are kept.
+COLUMN_CACHE_TTL = 300
+COLUMN_CACHE_MAX = 5000
+_column_cache = {}
+_column_cache_lock = threading.Lock()
+
+
+def _column_cache_key(conn, full_table_name: str):
+    """Identify a table across connections, or None if the connection can't say where it points.
+    Spellings of the same table ([db].[dbo].[T], dbo.T, T) share one key."""
+    try:
+        server = conn.getinfo(pyodbc.SQL_SERVER_NAME)
+        database = conn.getinfo(pyodbc.SQL_DATABASE_NAME)
+        db, schema, table = parse_table_name(full_table_name)
+    except Exception:
+        return None
+    return (server.lower(), (db or database).lower(), schema.lower(), table.lower())
+
+
+def invalidate_column_cache(schema=None, table=None):
+    """Forget cached table schemas (e.g. after the user refreshes the table list).
+    With schema and/or table given, only matching tables are forgotten."""
+    with _column_cache_lock:
+        if schema is None and table is None:
+            _column_cache.clear()
+            return
+        for key in list(_column_cache):
+            if ((schema is None or key[2] == schema.lower())
+                    and (table is None or key[3] == table.lower())):
+                del _column_cache[key]
+
+
 def get_table_columns(conn, full_table_name: str):
+    """Return [(column_name, data_type, char_max)] for a table.
+    Results are cached for COLUMN_CACHE_TTL seconds per server/database/table."""
+    key = _column_cache_key(conn, full_table_name)
+    cached = _cached_columns(key)
+    if cached is not None:
+        return list(cached)
+    cols = _query_table_columns(conn, full_table_name)
+    if key is not None and cols:
+        _store_columns({key: cols})
+    return cols
+
+
+def _store_columns(entries):
+    """Cache {key: cols}, evicting expired and then the oldest entries beyond COLUMN_CACHE_MAX"""
+    now = time.monotonic()
+    with _column_cache_lock:
+        for key, cols in entries.items():
+            # Re-insert so dict order stays oldest-first
+            _column_cache.pop(key, None)
+            _column_cache[key] = (now, tuple(cols))
+        excess = len(_column_cache) - COLUMN_CACHE_MAX
+        if excess > 0:
+            for key in [k for k, (fetched_at, _) in _column_cache.items()
+                        if now - fetched_at >= COLUMN_CACHE_TTL]:
+                del _column_cache[key]
+            excess = len(_column_cache) - COLUMN_CACHE_MAX
+            for key in list(_column_cache)[:max(excess, 0)]:
+                del _column_cache[key]
+
+
+def _cached_columns(key):
+    """Cached columns for a _column_cache_key, or None if missing or expired"""
+    if key is None:
+        return None
+    with _column_cache_lock:
+        cached = _column_cache.get(key)
+    if cached and time.monotonic() - cached[0] < COLUMN_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _query_table_columns(conn, full_table_name: str):
     db, schema, table = parse_table_name(full_table_name)
     if db:
         prefix = f"[{db}]."
@@ -916,34 +1782,85 @@ def get_table_columns(conn, full_table_name: str):
     """
     cur = conn.cursor()
     cur.execute(sql, (schema, table))
-    cols = []
-    
-    for row in cur.fetchall():
-        col_name = row.COLUMN_NAME
-        data_type = row.DATA_TYPE
-        char_max = row.CHAR_MAX
-        
-        # sys.columns stores max_length in bytes
-        # For nvarchar, max_length is 2 * actual char count, for varchar it's 1:1
-        if char_max and char_max > 0:
-            if 'nvarchar' in data_type.lower():
-                char_max = char_max // 2  # Convert bytes to characters
-            elif 'varchar' in data_type.lower() or 'char' in data_type.lower():
-                char_max = char_max  # Already in characters
-        
-        cols.append((col_name, data_type, char_max if char_max and char_max > 0 else None))
-    
-    return cols
+    return [_column_entry(name, data_type, char_max) for name, data_type, char_max in cur.fetchall()]
+
+
+def _column_entry(col_name, data_type, char_max):
+    """(column_name, data_type, char_max) from a sys.columns row"""
+    # sys.columns stores max_length in bytes
+    # For nvarchar, max_length is 2 * actual char count, for varchar it's 1:1
+    if char_max and char_max > 0:
+        if 'nvarchar' in data_type.lower():
+            char_max = char_max // 2  # Convert bytes to characters
+        elif 'varchar' in data_type.lower() or 'char' in data_type.lower():
+            char_max = char_max  # Already in characters
+    return (col_name, data_type, char_max if char_max and char_max > 0 else None)
+
 
+def get_all_columns(conn, tables=None):
+    """Return {(schema, table): [(column_name, data_type, char_max)]} for every table in
+    the connection's database (or only the given table names that live there), in one
+    query, and fill the get_table_columns cache with it."""
+    try:
+        server = conn.getinfo(pyodbc.SQL_SERVER_NAME).lower()
+        database = conn.getinfo(pyodbc.SQL_DATABASE_NAME).lower()
+    except Exception:
+        server = database = None
+    where, params = '', []
+    if tables is not None:
+        pairs = set()
+        for full_name in tables:
+            db, schema, table = parse_table_name(full_name)
+            if db is None or (database is not None and db.lower() == database):
+                pairs.add((schema, table))
+        if not pairs:
+            return {}
+        if len(pairs) * 2 <= SQL_SERVER_MAX_PARAMS:
+            where = "WHERE " + " OR ".join("(s.name = ? AND tbl.name = ?)" for _ in pairs)
+            params = [value for pair in sorted(pairs) for value in pair]
+    cur = conn.cursor()
+    cur.arraysize = METADATA_FETCH_ROWS
+    cur.execute(f"""
+        SELECT
+            s.name as TABLE_SCHEMA,
+            tbl.name as TABLE_NAME,
+            c.name as COLUMN_NAME,
+            t.name as DATA_TYPE,
+            c.max_length as CHAR_MAX
+        FROM sys.columns c
+        INNER JOIN sys.types t ON c.user_type_id = t.user_type_id
+        INNER JOIN sys.tables tbl ON c.object_id = tbl.object_id
+        INNER JOIN sys.schemas s ON tbl.schema_id = s.schema_id
+        {where}
+        ORDER BY s.name, tbl.name, c.column_id
+    """, params)
+    result = {}
+    while True:
+        rows = cur.fetchmany()
+        if not rows:
+            break
+        for schema, table, name, data_type, char_max in rows:
+            result.setdefault((schema, table), []).append(_column_entry(name, data_type, char_max))
+    if server is not None:
+        _store_columns({(server, database, schema.lower(), table.lower()): cols
+                        for (schema, table), cols in result.items()})
+    return result
 
+
+_SQL_TYPE_COERCIONS = {
+    'int': 'int', 'smallint': 'int', 'bigint': 'int', 'tinyint': 'int',
+    'decimal': 'float', 'numeric': 'float', 'money': 'float', 'smallmoney': 'float',
+    'float': 'float', 'real': 'float',
+    'bit': 'bool',
+}
+
+
+@functools.lru_cache(maxsize=64)
 def sql_type_to_coercion(data_type: str):
     t = data_type.lower()
-    if t in ('int', 'smallint', 'bigint', 'tinyint'):
-        return 'int'
-    if t in ('decimal', 'numeric', 'money', 'smallmoney', 'float', 'real'):
-        return 'float'
-    if t in ('bit',):
-        return 'bool'
+    coercion = _SQL_TYPE_COERCIONS.get(t)
+    if coercion is not None:
+        return coercion
     if 'char' in t or 'text' in t or 'xml' in t or 'uniqueidentifier' in t:
         return 'str'
     if 'date' in t or 'time' in t or 'datetime' in t or 'smalldatetime' in t:
@@ -952,6 +1869,96 @@ def sql_type_to_coercion(data_type: str):
     return 'str'
 
 
+# Text (lowercased, stripped) accepted for BIT columns; anything else becomes NULL.
+# Floats in object columns stringify as '1.0' / '0.0'.
+BIT_TEXT_VALUES = {
+    '1': True, '1.0': True, 'true': True, 'yes': True, 'y': True, 't': True, 'on': True,
+    '0': False, '0.0': False, 'false': False, 'no': False, 'n': False, 'f': False, 'off': False,
+}
+
+
+def fuzzy_match_column_name(expected, available, threshold=0.85):
+    """Find best fuzzy match for expected column name in available columns."""
+    if SequenceMatcher is None:
+        return None
+    best_match = None
+    best_ratio = threshold
+    for avail in available:
+        ratio = SequenceMatcher(None, expected.lower(), str(avail).lower()).ratio()
+        if ratio > best_ratio:
+            best_ratio = ratio
+            best_match = avail
+    return best_match
+
+
+def read_file_header(file_path):
+    """Return the header row of a CSV or .xlsx file without reading its data, or None"""
+    ext = Path(file_path).suffix.lower()
+    try:
+        if ext == '.csv':
+            return list(pd.read_csv(file_path, nrows=0).columns)
+        if ext in ('.xlsx', '.xlsm'):
+            from openpyxl import load_workbook
+            wb = load_workbook(filename=file_path, read_only=True, data_only=True)
+            try:
+                row = next(wb.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+            finally:
+                wb.close()
+            return list(row)
+    except Exception:
+        pass
+    return None
+
+
+def select_file_columns(file_path, table_cols):
+    """
+    Return the file columns prepare_dataframe_for_table would keep for table_cols
+    (exact or fuzzy name matches), for passing as usecols= to the reader so
+    unused columns are never parsed. Returns None to read every column.
+    """
+    header = read_file_header(file_path)
+    if not header or any(not isinstance(h, str) for h in header):
+        return None
+    if len(set(header)) != len(header):
+        return None  # pandas renames duplicates ("X.1"); let it read everything
+    by_key = {h.lower().strip(): h for h in header}
+    keep = []
+    for exp, _, _ in table_cols:
+        actual = by_key.get(exp.lower())
+        if actual is None:
+            actual = fuzzy_match_column_name(exp, [h for h in header if h not in keep])
+        if actual is not None and actual not in keep:
+            keep.append(actual)
+    if not keep or len(keep) == len(header):
+        return None
+    return keep
+
+
+# Text that starts like an ISO 8601 date (2024-01-31, 2024-01-31 08:00, 2024-01-31T08:00:00)
+_ISO_DATE_RE = re.compile(r'\s*\d{4}-\d{2}-\d{2}')
+
+
+def to_datetime_coerce(series):
+    """
+    pd.to_datetime(series, errors='coerce'). Text columns whose sampled values all
+    look like ISO 8601 dates are parsed with format='ISO8601' (pandas >= 2.0), which
+    skips format inference and accepts date-only and date-time values side by side.
+    """
+    # object, StringDtype and pandas 3's default str columns
+    if pd.api.types.is_string_dtype(series.dtype):
+        try:
+            iso_supported = int(pd.__version__.split('.')[0]) >= 2
+        except ValueError:
+            iso_supported = False
+        sample = series.dropna().head(20).tolist()
+        if iso_supported and sample and all(isinstance(v, str) and _ISO_DATE_RE.match(v) for v in sample):
+            try:
+                return pd.to_datetime(series, errors='coerce', format='ISO8601')
+            except (ValueError, TypeError):
+                pass
+    return pd.to_datetime(series, errors='coerce')
+
+
 def prepare_dataframe_for_table(df: 'pd.DataFrame', table_cols, filename=None):
     """Align and coerce a DataFrame to the target table columns.
     table_cols: list of (colname, data_type, char_max_length)
@@ -962,113 +1969,119 @@ def prepare_dataframe_for_table(df: 'pd.DataFrame', table_cols, filename=None):
     # normalize column names for matching (case-insensitive)
     orig_cols = list(df.columns)
     col_map = {c.lower().strip(): c for c in orig_cols}
-    prepared = df.copy()
-    prepared.columns = [c.strip() for c in prepared.columns]
+    by_name = {c.strip(): c for c in orig_cols}
 
-    # Fuzzy match function
-    def fuzzy_match(expected, available, threshold=0.85):
-        """Find best fuzzy match for expected column name in available columns."""
-        if SequenceMatcher is None:
-            return None
-        best_match = None
-        best_ratio = threshold
-        for avail in available:
-            ratio = SequenceMatcher(None, expected.lower(), avail.lower()).ratio()
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_match = avail
-        return best_match
-
-    # Ensure all expected columns exist
+    # Pick the file column for each expected column. The result is assembled from
+    # just those columns (in table order), so the frame is never copied as a whole
+    # and extra columns are never carried along.
     expected_cols = [c for c, _, _ in table_cols]
     missing_cols = []
-    extra_cols = []
+    sources = {}
+    used = set()
     
     for exp in expected_cols:
         # try exact case-insensitive match first
-        key = exp.lower()
-        if key in col_map:
-            actual = col_map[key]
-            if actual != exp:
-                prepared.rename(columns={actual: exp}, inplace=True)
-        else:
+        actual = col_map.get(exp.lower())
+        if actual is None:
             # try fuzzy match (e.g., "Prim. Oncologist" -> "Prim# Oncologist")
-            fuzzy = fuzzy_match(exp, prepared.columns)
+            fuzzy = fuzzy_match_column_name(exp, [n for n, c in by_name.items() if c not in used])
             if fuzzy:
                 print(f"Note: Auto-mapping Excel column '{fuzzy}' to expected '{exp}'")
-                prepared.rename(columns={fuzzy: exp}, inplace=True)
-            else:
-                # missing column -> create with NULLs
-                missing_cols.append(exp)
-                prepared[exp] = None
-
-    # Track unexpected extra columns (those that didn't match anything)
-    for c in list(prepared.columns):
-        if c.lower() not in [ec.lower() for ec in expected_cols]:
-            extra_cols.append(c)
+                actual = by_name[fuzzy]
+        if actual is None:
+            # missing column -> NULLs
+            missing_cols.append(exp)
+        else:
+            sources[exp] = actual
+            used.add(actual)
 
-    # Drop unexpected extra columns
+    # Unexpected extra columns (those that didn't match anything) are left out
+    extra_cols = [c.strip() for c in orig_cols if c not in used]
     if extra_cols:
         print(f"Warning: dropping extra columns from file {filename or ''}: {extra_cols}")
-        prepared.drop(columns=extra_cols, inplace=True)
     
     if missing_cols:
         print(f"Warning: Excel missing columns {missing_cols}, will insert NULLs for file {filename or ''}")
 
-    # Reorder to expected
-    prepared = prepared[expected_cols]
+    prepared = pd.DataFrame(
+        {exp: df[sources[exp]] if exp in sources else pd.Series(None, index=df.index, dtype=object)
+         for exp in expected_cols},
+        index=df.index, copy=False)
 
-    # Coerce types and truncate strings to fit column width
+    # Coerce types and truncate strings to fit column width. Columns the reader
+    # already produced with a compatible dtype skip the generic conversion.
+    ptypes = pd.api.types
     for col_name, sql_type, char_max_length in table_cols:
         coercion = sql_type_to_coercion(sql_type)
+        dtype = prepared[col_name].dtype
         if coercion == 'int':
-            prepared[col_name] = pd.to_numeric(prepared[col_name], errors='coerce').astype('Int64')
+            if ptypes.is_integer_dtype(dtype):
+                prepared[col_name] = prepared[col_name].astype('Int64')
+            else:
+                prepared[col_name] = pd.to_numeric(prepared[col_name], errors='coerce').astype('Int64')
         elif coercion == 'float':
-            prepared[col_name] = pd.to_numeric(prepared[col_name], errors='coerce').astype('float64')
+            if str(dtype) == 'float64':
+                pass
+            elif ptypes.is_float_dtype(dtype) or ptypes.is_integer_dtype(dtype):
+                # Already numeric (e.g. arrow-backed double/int64): a direct cast, no parsing
+                prepared[col_name] = prepared[col_name].astype('float64')
+            else:
+                prepared[col_name] = pd.to_numeric(prepared[col_name], errors='coerce').astype('float64')
+        elif coercion == 'bool' and ptypes.is_bool_dtype(dtype):
+            prepared[col_name] = prepared[col_name].astype('boolean')
         elif coercion == 'bool':
-            # Handle BIT columns: convert various formats to boolean, empty/blank to NULL
-            def convert_to_bit(v):
-                # Handle None, NaN, empty strings, whitespace - convert to NULL
-                if pd.isna(v):
-                    return pd.NA
-                if isinstance(v, str) and v.strip() == '':
-                    return pd.NA
-                # Handle boolean values directly
-                if isinstance(v, bool):
-                    return v
-                # Handle numeric: 1 = True, 0 = False, anything else = NULL
-                if isinstance(v, (int, float)):
-                    if v == 1:
-                        return True
-                    elif v == 0:
-                        return False
-                    else:
-                        return pd.NA
-                # Handle string representations (case-insensitive)
-                v_str = str(v).strip().lower()
-                if v_str in ('1', 'true', 'yes', 'y', 't', 'on'):
-                    return True
-                elif v_str in ('0', 'false', 'no', 'n', 'f', 'off', ''):
-                    return False
-                # Default to NULL for unrecognized values (empty strings already handled above)
-                return pd.NA
-            
-            prepared[col_name] = prepared[col_name].apply(convert_to_bit).astype('boolean')
+            # Handle BIT columns: 1/0 and common yes/no spellings, anything else
+            # (including empty/blank) is NULL
+            col = prepared[col_name]
+            if ptypes.is_numeric_dtype(dtype):
+                bits = pd.Series(pd.NA, index=col.index, dtype='boolean')
+                bits[(col == 1).fillna(False).astype(bool)] = True
+                bits[(col == 0).fillna(False).astype(bool)] = False
+                prepared[col_name] = bits
+            else:
+                text = col.astype('string').str.strip().str.lower()
+                prepared[col_name] = text.map(BIT_TEXT_VALUES).astype('boolean')
         elif coercion == 'datetime':
-            prepared[col_name] = pd.to_datetime(prepared[col_name], errors='coerce')
+            if not ptypes.is_datetime64_any_dtype(dtype):
+                prepared[col_name] = to_datetime_coerce(prepared[col_name])
         else:
             # String type - convert to string and truncate if needed
-            prepared[col_name] = prepared[col_name].astype('string')
+            if str(dtype) != 'string':
+                prepared[col_name] = prepared[col_name].astype('string')
             # Truncate strings to fit column width if a limit is defined
             if char_max_length and char_max_length > 0:
-                prepared[col_name] = prepared[col_name].apply(
-                    lambda x: str(x)[:char_max_length] if pd.notna(x) else None
-                )
+                prepared[col_name] = prepared[col_name].str.slice(0, char_max_length)
 
     return prepared
 
 
-def validate_and_prepare_files_for_entry(conn, entry, base: Path):
+def read_table_file(file_path, table_cols, dtype_backend=None):
+    """
+    Read a CSV or Excel file (only the columns that map to table_cols) and prepare
+    it for upload. Module-level so it can run in a worker process.
+    Returns (rows_read, columns_read, prepared DataFrame).
+    """
+    file_path = Path(file_path)
+    usecols = select_file_columns(file_path, table_cols)
+    if file_path.suffix.lower() == '.csv':
+        backend = dtype_backend_kwargs(dtype_backend)
+        try:
+            df = pd.read_csv(file_path, usecols=usecols, **backend)
+        except Exception:
+            if not backend:
+                raise
+            df = pd.read_csv(file_path, usecols=usecols)
+    else:
+        try:
+            df = read_excel_fast(file_path, dtype_backend=dtype_backend, usecols=usecols)
+        except Exception:
+            print(f"(Falling back to default reader for {file_path.name}...)")
+            df = pd.read_excel(file_path)
+    prepared = prepare_dataframe_for_table(df, table_cols, filename=file_path.name)
+    return len(df), len(df.columns), prepared
+
+
+def validate_and_prepare_files_for_entry(conn, entry, base: Path, dtype_backend=None):
     """Given a config entry, find files in the folder, convert non-Excel to Excel, align columns and coerce types.
     Returns list of tuples (original_path, prepared_df)
     """
@@ -1092,65 +2105,135 @@ def validate_and_prepare_files_for_entry(conn, entry, base: Path):
     table_cols = get_table_columns(conn, ttable)
 
     for f in files:
-        try:
-            # read file (Excel expected)
-            if f.suffix.lower() in ('.xls', '.xlsx'):
-                try:
-                    df = pd.read_excel(f)
-                except Exception as e:
-                    # Provide a clearer message for common tempfile/permission issues
-                    msg = str(e)
-                    if isinstance(e, (PermissionError, OSError)) or 'temp' in msg.lower() or 'temporary' in msg.lower():
-                        print(f"Error reading Excel file {f}: {e}\n"
-                              "This often indicates a problem creating temporary files (permissions, disk space, or OneDrive sync)."
-                              " Try freeing disk space, checking permissions on your TEMP directory, or disabling OneDrive sync for this folder.")
-                    else:
-                        print(f"Error reading Excel file {f}: {e}")
-                    continue
-            else:
-                # attempt to read as CSV and convert to DataFrame
+        df_prepared = read_and_prepare_file(f, table_cols, dtype_backend)
+        if df_prepared is not None:
+            prepared_list.append((f, df_prepared, table_cols))
+    return prepared_list
+
+
+def read_and_prepare_file(f: Path, table_cols, dtype_backend=None):
+    """Read one inbound file (Excel, else CSV) and prepare it for the table.
+    Excel is parsed by calamine when installed; dtype_backend='pyarrow' reads into
+    arrow-backed columns, which prepare_dataframe_for_table casts without re-parsing.
+    Returns the prepared DataFrame, or None (after printing why) if it could not be used."""
+    try:
+        # read file (Excel expected)
+        usecols = select_file_columns(f, table_cols)
+        if f.suffix.lower() in ('.xls', '.xlsx'):
+            try:
+                if f.suffix.lower() == '.xlsx' and excel_engine() is None and not dtype_backend:
+                    # No calamine: stream the sheet, keeping only the columns the table uses
+                    df = read_xlsx_streaming(f, usecols=usecols)
+                else:
+                    df = read_excel_fast(f, dtype_backend=dtype_backend, usecols=usecols)
+            except Exception as e:
+                # Provide a clearer message for common tempfile/permission issues
+                msg = str(e)
+                if isinstance(e, (PermissionError, OSError)) or 'temp' in msg.lower() or 'temporary' in msg.lower():
+                    print(f"Error reading Excel file {f}: {e}\n"
+                          "This often indicates a problem creating temporary files (permissions, disk space, or OneDrive sync)."
+                          " Try freeing disk space, checking permissions on your TEMP directory, or disabling OneDrive sync for this folder.")
+                else:
+                    print(f"Error reading Excel file {f}: {e}")
+                return None
+        else:
+            # attempt to read as CSV and convert to DataFrame
+            try:
                 try:
-                    df = pd.read_csv(f)
+                    df = pd.read_csv(f, usecols=usecols, **dtype_backend_kwargs(dtype_backend))
                 except Exception:
-                    print(f"Skipping unreadable file {f}")
-                    continue
+                    if not dtype_backend:
+                        raise
+                    df = pd.read_csv(f, usecols=usecols)
+            except Exception:
+                print(f"Skipping unreadable file {f}")
+                return None
 
-            # prepare DataFrame
-            df_prepared = prepare_dataframe_for_table(df, table_cols, filename=str(f.name))
-            prepared_list.append((f, df_prepared, table_cols))
-        except Exception as e:
-            print(f"Error preparing file {f}: {e}")
-    return prepared_list
+        # prepare DataFrame
+        return prepare_dataframe_for_table(df, table_cols, filename=str(f.name))
+    except Exception as e:
+        print(f"Error preparing file {f}: {e}")
+        return None
+
+
+def upload_options_from_cfg(cfg: dict) -> dict:
+    """Insert tunables from config.json as upload_df_to_table keyword arguments:
+    batch_size (rows per executemany), method ("insert_method"), bulk_insert_dir, commit_rows,
+    bcp_dbcfg (the db section when "insert_method" is "bcp")"""
+    method = cfg.get('insert_method')
+    # "bcp" loads each file with the bcp utility; row inserts remain the fallback
+    use_bcp = method == 'bcp'
+    if method not in ('fast', 'multi', 'bulkcopy'):
+        # The legacy "SQL Server" driver has no reliable parameter-array support,
+        # so send multi-row VALUES statements instead of fast_executemany
+        method = 'multi' if cfg.get('db', {}).get('driver') == 'SQL Server' else 'fast'
+    try:
+        batch_size = max(1, int(cfg.get('batch_size', 5000)))
+    except (TypeError, ValueError):
+        batch_size = 5000
+    try:
+        commit_rows = max(0, int(cfg.get('commit_rows', 100000)))
+    except (TypeError, ValueError):
+        commit_rows = 100000
+    return {
+        'batch_size': batch_size,
+        'method': method,
+        'bulk_insert_dir': cfg.get('bulk_insert_dir') or None,
+        'commit_rows': commit_rows,
+        'bcp_dbcfg': cfg.get('db', {}) if use_bcp else None,
+    }
 
 
-def upload_from_folders(cfg_path: Path):
+def upload_from_folders(cfg_path: Path, files=None, upload_modes=None, conn=None):
+    """Upload the files of each configured folder into its target_table.
+    `files` optionally maps a folder (as written in config.json) to source files to
+    load for it, read where they are; then only those folders are uploaded.
+    `upload_modes` optionally maps a folder to its mode, overriding config.json.
+    An open connection may be passed in; it is left open for the caller."""
     if pd is None:
         raise SystemExit('pandas is not installed. Install with: pip install pandas openpyxl')
-    cfg = json.load(open(cfg_path, 'r', encoding='utf-8'))
+    cfg = load_cfg(cfg_path)
     base_dir = Path(__file__).parent.resolve()
 
-    # First scan all configured folders to see if any matching files exist.
-    any_files_found = False
+    # First find the files for every configured folder (once; reused below).
+    folder_files = {}
     for entry in cfg.get('folders', []):
         folder = entry.get('folder')
         if not folder:
             continue
-        patterns = entry.get('file_patterns', ['*.xlsx', '*.xls'])
-        files = find_files(folder, patterns, base_dir)
-        if files:
-            any_files_found = True
-            break
+        if files is not None:
+            folder_files[folder] = [Path(p) for p in files.get(folder, ())]
+        else:
+            patterns = entry.get('file_patterns', ['*.xlsx', '*.xls'])
+            folder_files[folder] = find_files(folder, patterns, base_dir)
 
-    if not any_files_found:
+    if not any(folder_files.values()):
         print('No files found in any configured inbound folders. Skipping upload step.')
         return
 
     # Proceed to connect and upload only if files were found
-    conn = connect_from_cfg(cfg['db'])
+    owns_conn = conn is None
+    if owns_conn:
+        conn = connect_from_cfg(cfg['db'])
     try:
+        # Several uncached target tables: read their columns in one query instead of one each
+        targets = {entry.get('target_table') for entry in cfg.get('folders', [])
+                   if entry.get('target_table') and folder_files.get(entry.get('folder'))}
+        uncached = [t for t in targets if _cached_columns(_column_cache_key(conn, t)) is None]
+        if len(uncached) > 1:
+            try:
+                get_all_columns(conn, uncached)
+            except Exception as e:
+                print(f"Could not prefetch table columns ({e}); reading them per table")
+                conn.rollback()
+
+        # Resolve files and table schemas up front, on this thread's connection
+        jobs = []
         for entry in cfg.get('folders', []):
             ttable = entry.get('target_table')
             folder = entry.get('folder')
+            if files is not None and not folder_files.get(folder):
+                continue
             if not ttable:
                 print(f"Skipping folder {folder} (no target_table set).")
                 continue
@@ -1158,35 +2241,163 @@ def upload_from_folders(cfg_path: Path):
                 print('No folder set for entry, skipping')
                 continue
 
-            prepared_files = validate_and_prepare_files_for_entry(conn, entry, base_dir)
-            if not prepared_files:
+            entry_files = folder_files.get(folder)
+            if not entry_files:
                 print(f"No valid files found in {folder}")
                 continue
-            
+            table_cols = get_table_columns(conn, ttable)
             # Determine upload mode from config
             upload_mode = entry.get('upload_mode', 'append')  # default to append for backward compatibility
-            
-            for orig_path, df, table_cols in prepared_files:
+            if upload_modes and upload_modes.get(folder):
+                upload_mode = upload_modes[folder]
+            jobs.extend((f, folder, ttable, table_cols, upload_mode) for f in entry_files)
+
+        options = upload_options_from_cfg(cfg)
+        # Same reader settings as the GUI's quick upload (e.g. "pyarrow")
+        dtype_backend = cfg.get('dtype_backend') or None
+        # By default each folder loads in one transaction: one commit (log flush) per
+        # folder, and a 'delete' folder is never left cleared but half loaded
+        per_folder = bool(cfg.get('transaction_per_folder', True))
+        # Files above chunked_upload_mb are streamed chunk_rows rows at a time instead of read whole
+        try:
+            stream_bytes = float(cfg.get('chunked_upload_mb', 50)) * 1024 * 1024
+            chunk_rows = max(1, int(cfg.get('chunk_rows', 25000)))
+        except (TypeError, ValueError):
+            stream_bytes, chunk_rows = 50 * 1024 * 1024, 25000
+
+        # A reader thread reads and prepares the next files while this thread uploads.
+        # The queue holds at most 2 prepared files (plus one in flight per parse
+        # worker), which bounds memory.
+        prepared = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        done = object()
+
+        def offer(item):
+            # Block while the queue is full, but give up once the uploader has stopped
+            while not stop.is_set():
+                try:
+                    prepared.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def reader():
+            # Small files are parsed in worker processes (each with its own GIL), up to
+            # one per core ahead of the uploader; results are handed over in job order
+            streamed = [f.stat().st_size > stream_bytes for f, *_ in jobs]
+            workers = min(os.cpu_count() or 1, streamed.count(False))
+            pool = None
+            if workers > 1:
+                try:
+                    pool = ProcessPoolExecutor(max_workers=workers)
+                except Exception as e:
+                    print(f"Reading files in-process ({e})")
+            pending = deque()
+            todo = iter(zip(jobs, streamed))
+
+            def fill():
+                while len(pending) < max(1, workers):
+                    nxt = next(todo, None)
+                    if nxt is None:
+                        return
+                    (f, _, _, table_cols, _), stream = nxt
+                    future = None
+                    if pool is not None and not stream:
+                        future = pool.submit(read_and_prepare_file, f, table_cols, dtype_backend)
+                    pending.append((nxt, future))
+
+            try:
+                fill()
+                while pending:
+                    ((f, folder, ttable, table_cols, upload_mode), stream), future = pending.popleft()
+                    if stream:
+                        # Streamed by the uploading thread; nothing to read here
+                        df = None
+                    elif future is not None:
+                        try:
+                            df = future.result()
+                        except BrokenProcessPool:
+                            df = read_and_prepare_file(f, table_cols, dtype_backend)
+                    else:
+                        df = read_and_prepare_file(f, table_cols, dtype_backend)
+                    fill()
+                    if df is None and not stream:
+                        continue
+                    if not offer((f, folder, df, ttable, table_cols, upload_mode)):
+                        return
+                offer(done)
+            except BaseException as e:
+                offer(e)
+            finally:
+                if pool is not None:
+                    for _, future in pending:
+                        if future is not None:
+                            future.cancel()
+                    pool.shutdown(wait=False)
+
+        reader_thread = threading.Thread(target=reader, daemon=True)
+        reader_thread.start()
+        open_folder = None
+        try:
+            while True:
+                item = prepared.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                orig_path, folder, df, ttable, table_cols, upload_mode = item
+                if folder != open_folder:
+                    if per_folder and open_folder is not None:
+                        conn.commit()
+                        print(f"Committed {open_folder}")
+                    open_folder = folder
+                elif upload_mode != 'append':
+                    # The table was already cleared for this folder's first file
+                    upload_mode = 'append'
                 print(f"Uploading {orig_path} -> {ttable} (mode: {upload_mode})")
-                upload_df_to_table(conn, df, ttable, upload_mode=upload_mode, table_cols=table_cols)
-                print(f"Uploaded {len(df)} rows from {orig_path.name}")
+                if df is None:
+                    # Large file: never held whole in memory; each chunk commits as it lands
+                    rows = upload_excel_in_chunks(orig_path, conn, ttable, table_cols, upload_mode=upload_mode,
+                                                  chunk_size=chunk_rows, **options)
+                else:
+                    upload_df_to_table(conn, df, ttable, upload_mode=upload_mode, table_cols=table_cols,
+                                       commit=not per_folder, **options)
+                    rows = len(df)
+                print(f"Uploaded {rows} rows from {orig_path.name}")
+                del item, df
+            if per_folder and open_folder is not None:
+                conn.commit()
+                print(f"Committed {open_folder}")
+        finally:
+            stop.set()
+            reader_thread.join(timeout=5)
     finally:
-        conn.close()
+        if owns_conn:
+            conn.close()
 
 
-def run_sql_scripts(seq_files, cfg_path: Path):
-    cfg = json.load(open(cfg_path, 'r', encoding='utf-8'))
-    conn = connect_from_cfg(cfg['db'])
+def run_sql_scripts(seq_files, cfg_path: Path, conn=None):
+    """Run the given .sql files in order and commit once at the end.
+    An open connection may be passed in; it is left open for the caller."""
+    owns_conn = conn is None
+    if owns_conn:
+        cfg = load_cfg(cfg_path)
+        conn = connect_from_cfg(cfg['db'])
     try:
         cursor = conn.cursor()
+        # No "N rows affected" message after every statement (@@ROWCOUNT still works)
+        cursor.execute("SET NOCOUNT ON")
         for sqlfile in seq_files:
             print('Running', sqlfile)
-            text = open(sqlfile, 'r', encoding='utf-8-sig').read()
-            for batch in split_sql_batches(text):
+            with open(sqlfile, 'r', encoding='utf-8-sig') as fh:
+                text = fh.read()
+            for batch in iter_sql_batches(text):
                 cursor.execute(batch)
         conn.commit()
     finally:
-        conn.close()
+        if owns_conn:
+            conn.close()
 
 
 def main():
@@ -1232,22 +2443,32 @@ def main():
             write_template_config(sql_files, folders, Path(args.config))
         return
 
-    if args.upload:
-        if not Path(args.config).exists():
-            print('config.json not found. Run --init first.')
-            return
-        upload_from_folders(Path(args.config))
+    if not (args.upload or args.run_sql):
+        return
+    if args.upload and not Path(args.config).exists():
+        print('config.json not found. Run --init first.')
+        return
 
-    if args.run_sql:
-        # Always attempt to upload files first using the configured folders
-        if Path(args.config).exists():
-            try:
-                print('Uploading files from configured inbound folders before running SQL scripts...')
-                ensure_folders_from_config(Path(args.config), base)
-                upload_from_folders(Path(args.config))
-            except Exception as e:
-                print('Warning: upload step failed or skipped:', e)
-        run_sql_scripts([str((base / f)) for f in sql_files], Path(args.config))
+    # One connection for the uploads and the scripts (each login is several round trips)
+    conn = connect_from_cfg(load_cfg(Path(args.config))['db'])
+    try:
+        if args.upload:
+            upload_from_folders(Path(args.config), conn=conn)
+
+        if args.run_sql:
+            # Always attempt to upload files first using the configured folders
+            if Path(args.config).exists():
+                try:
+                    print('Uploading files from configured inbound folders before running SQL scripts...')
+                    ensure_folders_from_config(Path(args.config), base)
+                    upload_from_folders(Path(args.config), conn=conn)
+                except Exception as e:
+                    print('Warning: upload step failed or skipped:', e)
+                    # Don't let the scripts' commit pick up a partial upload
+                    conn.rollback()
+            run_sql_scripts([str((base / f)) for f in sql_files], Path(args.config), conn=conn)
+    finally:
+        conn.close()
 
 
 if __name__ == '__main__':
@@ -36,6 +36,12 @@ from pathlib import Path
 from difflib import SequenceMatcher
 from openpyxl import load_workbook
 
+try:
+    # Optional: Rust Excel parser (reads .xlsx and .xls), much faster than openpyxl
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
 # Expected column mappings for each table
 TABLE_SCHEMAS = {
     'ActiveInsurance': [
@@ -143,7 +149,47 @@ def detect_table_from_columns(df_columns, threshold=0.65):
     return best_table, best_score
 
 
-def validate_file(file_path, table_name=None, validate_rows=True):
+def read_excel_head(file_path, nrows=10):
+    """
+    Read the header and first `nrows` rows of an Excel file as a DataFrame.
+    Uses python-calamine when installed, else openpyxl's streaming read-only mode,
+    so only the rows needed are parsed instead of the whole sheet.
+    """
+    if CalamineWorkbook is not None:
+        try:
+            sheet = CalamineWorkbook.from_path(str(file_path)).get_sheet_by_index(0)
+            # calamine reports empty cells as ''
+            rows = [[None if v == '' else v for v in row] for row in sheet.to_python(nrows=nrows + 1)]
+            return _rows_to_frame(iter(rows))
+        except Exception:
+            pass
+    if Path(file_path).suffix.lower() == '.xls':
+        return pd.read_excel(file_path, nrows=nrows)
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        return _rows_to_frame(ws.iter_rows(max_row=nrows + 1, values_only=True))
+    finally:
+        wb.close()
+
+
+def _rows_to_frame(rows):
+    """Build a DataFrame from an iterator of rows whose first row is the header"""
+    header = list(next(rows, ()))
+    # Drop trailing empty header cells (formatting-only columns)
+    while header and header[-1] is None:
+        header.pop()
+    width = len(header)
+    columns = [h if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)]
+    data = []
+    for row in rows:
+        row = list(row[:width]) + [None] * (width - len(row))
+        if any(v is not None for v in row):
+            data.append(row)
+    return pd.DataFrame(data, columns=columns)
+
+
+def validate_file(file_path, table_name=None, validate_rows=True, expected_columns=None):
     """
     Validate an Excel file against expected schema.
     
@@ -152,6 +198,8 @@ def validate_file(file_path, table_name=None, validate_rows=True):
         table_name (str, optional): Table name to validate against. If None, auto-detects.
         validate_rows (bool): If True, only validates first 10 rows for speed. 
                              If False, validates entire file.
+        expected_columns (list, optional): Expected columns, looked up once by the caller
+                             when validating many files for the same table.
     
     Returns:
         dict: Validation results with keys:
@@ -168,7 +216,12 @@ def validate_file(file_path, table_name=None, validate_rows=True):
     
     # Read only first 10 rows for fast validation
     try:
-        if validate_rows:
+        # openpyxl only reads .xlsx/.xlsm; calamine also handles legacy .xls
+        head_exts = ('.xlsx', '.xlsm', '.xls') if CalamineWorkbook is not None else ('.xlsx', '.xlsm')
+        if validate_rows and Path(file_path).suffix.lower() in head_exts:
+            df = read_excel_head(file_path, nrows=10)
+            print(f"(Validating first 10 rows for speed)")
+        elif validate_rows:
             df = pd.read_excel(file_path, nrows=10)
             print(f"(Validating first 10 rows for speed)")
         else:
@@ -183,6 +236,39 @@ def validate_file(file_path, table_name=None, validate_rows=True):
             'extra_columns': []
         }
     
+    return _validate_columns(df, table_name, expected_columns)
+
+
+def validate_schema_only(file_path, table_name=None, expected_columns=None):
+    """
+    Validate only the header row of a file against the expected schema.
+    Same result dict as validate_file (row_count is 0); use validate_file when
+    the data rows themselves need checking.
+    """
+    print(f"\n{'='*80}")
+    print(f"VALIDATING HEADER: {Path(file_path).name}")
+    print(f"{'='*80}\n")
+    
+    try:
+        suffix = Path(file_path).suffix.lower()
+        if suffix == '.csv':
+            df = pd.read_csv(file_path, nrows=0)
+        else:
+            df = read_excel_head(file_path, nrows=0)
+    except Exception as e:
+        return {
+            'valid': False,
+            'table_name': None,
+            'issues': [f"ERROR: Could not read file: {str(e)}"],
+            'column_mapping': {},
+            'missing_columns': [],
+            'extra_columns': []
+        }
+    return _validate_columns(df, table_name, expected_columns)
+
+
+def _validate_columns(df, table_name=None, expected_columns=None):
+    """Match the columns of `df` against the expected schema and report issues"""
     actual_cols = list(df.columns)
     issues = []
     
@@ -206,7 +292,10 @@ def validate_file(file_path, table_name=None, validate_rows=True):
         print(f"✓ Using specified table: {table_name}")
     
     # Step 2: Get expected columns for this table
-    expected_cols = TABLE_SCHEMAS.get(table_name, [])
+    if expected_columns is not None:
+        expected_cols = list(expected_columns)
+    else:
+        expected_cols = TABLE_SCHEMAS.get(table_name, [])
     if not expected_cols:
         issues.append(f"Unknown table: {table_name}")
         return {
@@ -275,23 +364,24 @@ def validate_file(file_path, table_name=None, validate_rows=True):
         print()
         issues.append(f"Found {len(extra_cols)} unexpected columns")
     
-    # Step 8: Check for data quality issues
-    print("DATA QUALITY CHECKS:")
-    
-    # Check for empty rows
-    empty_rows = df.isnull().sum(axis=1)
-    if (empty_rows == len(actual_cols)).any():
-        print(f"  ⚠ Found {(empty_rows == len(actual_cols)).sum()} completely empty rows")
-    
-    # Check for mostly empty columns
-    for col in actual_cols:
-        null_pct = df[col].isnull().sum() / len(df)
-        if null_pct > 0.8:
-            print(f"  ⚠ Column '{col}' is {null_pct:.0%} empty")
-    
-    # Check data type compatibility
-    print(f"  ✓ File has {len(df)} rows")
-    print()
+    # Step 8: Check for data quality issues (skipped for header-only checks)
+    if len(df):
+        print("DATA QUALITY CHECKS:")
+        
+        # Check for empty rows
+        empty_rows = df.isnull().sum(axis=1)
+        if (empty_rows == len(actual_cols)).any():
+            print(f"  ⚠ Found {(empty_rows == len(actual_cols)).sum()} completely empty rows")
+        
+        # Check for mostly empty columns
+        for col in actual_cols:
+            null_pct = df[col].isnull().sum() / len(df)
+            if null_pct > 0.8:
+                print(f"  ⚠ Column '{col}' is {null_pct:.0%} empty")
+        
+        # Check data type compatibility
+        print(f"  ✓ File has {len(df)} rows")
+        print()
     
     # Step 9: Overall validation result
     is_valid = len(missing_cols) == 0 and len(extra_cols) == 0